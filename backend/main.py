@@ -1,20 +1,66 @@
 import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from src.api.routes import router
+from src.core.document_processor import DocumentProcessor, init_parse_worker
+from src.core.model_manager import ModelManager
+from src.core.podcast_generator import PodcastProcessor
+from src.core.session_store import SessionStore, RAGCache
+from src.core.ingest_batcher import IngestBatcher
+from src.core.config import Config
+from src.utils.file_utils import sweep_stale_files
 from src.utils.logging import logger
 
+async def _sweep_tmp_dir():
+    # Requests clean up after themselves, but failures can still leak files; bound tmp/ usage here
+    while True:
+        await asyncio.sleep(Config.TMP_SWEEP_INTERVAL)
+        try:
+            await sweep_stale_files(Config.TMP_DIR, Config.TMP_MAX_AGE)
+        except Exception as e:
+            logger.error(f"Temp sweep failed: {str(e)}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    os.makedirs(Config.TMP_DIR, exist_ok=True)
+    # Heavy singletons are built once per worker process on startup, not at import time
+    # Document parsing is CPU-bound, so fan it out across this worker's share of the cores
+    app.state.parse_pool = ProcessPoolExecutor(max_workers=default_parse_workers(), initializer=init_parse_worker)
+    app.state.processor = DocumentProcessor(executor=app.state.parse_pool)
+    app.state.model_manager = ModelManager()
+    app.state.podcast = PodcastProcessor()
+    app.state.session_store = SessionStore()
+    app.state.rag_cache = RAGCache(app.state.session_store)
+    # Caps parse + embed work per worker; excess uploads queue instead of exhausting memory
+    app.state.ingest_semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_INGEST)
+    app.state.ingest_batcher = IngestBatcher(app.state.session_store, app.state.rag_cache, app.state.ingest_semaphore)
+    app.state.ingest_batcher.start()
+    sweeper = asyncio.create_task(_sweep_tmp_dir())
+    logger.info(f"Worker {os.getpid()} started")
+    yield
+    sweeper.cancel()
+    await app.state.ingest_batcher.stop()
+    await app.state.processor.aclose()
+    await app.state.podcast.aclose()
+    await app.state.session_store.close()
+    app.state.parse_pool.shutdown(wait=False, cancel_futures=True)
+
 app = FastAPI(
     title="NotebookLM Backend",
     description="A backend for processing documents, querying AI, and generating podcasts.",
-    version="1.1.0"
+    version="1.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware to allow frontend connections
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # baadme change krna hai malik
-    allow_credentials=True,
+    allow_origins=Config.CORS_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -22,6 +68,24 @@ app.add_middleware(
 # Include the router from routes.py
 app.include_router(router)
 
+def default_workers() -> int:
+    # The request path is I/O-bound (uploads, LLM and inference API calls), so use 2n+1 workers
+    return int(os.getenv("WEB_CONCURRENCY", str(2 * (os.cpu_count() or 1) + 1)))
+
+def default_parse_workers() -> int:
+    # Every uvicorn worker owns a parse pool that preloads docling in each process, so the
+    # cores are split between workers rather than each pool taking all of them
+    return int(os.getenv("PARSE_WORKERS", str(max(1, (os.cpu_count() or 1) // default_workers()))))
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=default_workers(),
+        limit_concurrency=int(os.environ["LIMIT_CONCURRENCY"]) if os.getenv("LIMIT_CONCURRENCY") else None,
+        reload=False
+    )
\ No newline at end of file
@@ -0,0 +1,30 @@
+import asyncio
+from fastapi import Request
+from src.core.document_processor import DocumentProcessor
+from src.core.model_manager import ModelManager
+from src.core.podcast_generator import PodcastProcessor
+from src.core.session_store import SessionStore, RAGCache
+from src.core.ingest_batcher import IngestBatcher
+
+# Per-process singletons are created in the app lifespan (see main.py) and injected into routes.
+
+def get_processor(request: Request) -> DocumentProcessor:
+    return request.app.state.processor
+
+def get_model_manager(request: Request) -> ModelManager:
+    return request.app.state.model_manager
+
+def get_podcast_processor(request: Request) -> PodcastProcessor:
+    return request.app.state.podcast
+
+def get_session_store(request: Request) -> SessionStore:
+    return request.app.state.session_store
+
+def get_rag_cache(request: Request) -> RAGCache:
+    return request.app.state.rag_cache
+
+def get_ingest_semaphore(request: Request) -> asyncio.Semaphore:
+    return request.app.state.ingest_semaphore
+
+def get_ingest_batcher(request: Request) -> IngestBatcher:
+    return request.app.state.ingest_batcher
@@ -1,145 +1,286 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Request
+from fastapi.responses import StreamingResponse, ORJSONResponse
 import uuid
 import os
-from src.core.document_processor import DocumentProcessor
+import sys
+import time
+import tempfile
+import asyncio
+import aiofiles
+import aiofiles.os
+from src.core.document_processor import DocumentProcessor, ProcessingResult
 from src.core.rag_system import RAGSystem
 from src.core.podcast_generator import PodcastProcessor
 from src.core.model_manager import ModelManager
+from src.core.session_store import SessionStore, RAGCache, index_path_for, remove_index
+from src.core.ingest_batcher import IngestBatcher
+from src.core.config import Config
+from src.api.dependencies import (
+    get_processor, get_model_manager, get_podcast_processor,
+    get_session_store, get_rag_cache, get_ingest_semaphore, get_ingest_batcher
+)
 from src.api.schemas import (
     SessionResponse, QueryRequest, QueryResponse,
     PodcastRequest, PodcastResponse, ModelSwitchRequest, ModelSwitchResponse
 )
 from src.utils.logging import logger
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Tuple
 
 router = APIRouter()
-SESSION_MANAGER = {
-    "sessions": {}  # In-memory session store; consider a persistent store for production
-}
-processor = DocumentProcessor()
-model_manager = ModelManager()
-podcast_processor = PodcastProcessor()
+
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1MB
+USE_SENDFILE = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+
+def _sendfile_copy(src_fd: int, dest_path: str, size: int) -> None:
+    """
+    Copy `size` bytes from an open file descriptor to dest_path entirely in the kernel.
+    """
+    dst_fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    finally:
+        os.close(dst_fd)
+
+async def _save_upload(file: UploadFile, dest_path: str) -> None:
+    """
+    Stream an uploaded file to disk in fixed-size chunks, aborting once it exceeds Config.MAX_FILE_SIZE.
+    """
+    if file.size is not None and file.size > Config.MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail=f"File {file.filename} exceeds size limit")
+
+    # Uploads that Starlette already spilled to disk can be copied without passing through Python
+    spooled = file.file
+    if USE_SENDFILE and isinstance(spooled, tempfile.SpooledTemporaryFile) and getattr(spooled, "_rolled", False):
+        src_fd = spooled.fileno()
+        size = os.fstat(src_fd).st_size
+        if size > Config.MAX_FILE_SIZE:
+            raise HTTPException(status_code=413, detail=f"File {file.filename} exceeds size limit")
+        try:
+            await asyncio.to_thread(_sendfile_copy, src_fd, dest_path, size)
+            return
+        except OSError as e:
+            logger.warning(f"sendfile failed for {file.filename}, falling back to streamed copy: {str(e)}")
+
+    written = 0
+    async with aiofiles.open(dest_path, "wb") as out:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > Config.MAX_FILE_SIZE:
+                break
+            await out.write(chunk)
+    if written > Config.MAX_FILE_SIZE:
+        await aiofiles.os.remove(dest_path)
+        raise HTTPException(status_code=413, detail=f"File {file.filename} exceeds size limit")
+
+def _check_content_length(request: Request, file_count: int) -> None:
+    """
+    Reject oversized uploads from the Content-Length header before any file is written.
+    Starlette has already spooled the multipart body by the time a route runs, so this only
+    saves the copy into Config.TMP_DIR; refusing the body itself would take a middleware.
+    """
+    if int(request.headers.get("content-length", 0)) > Config.MAX_FILE_SIZE * max(file_count, 1):
+        raise HTTPException(status_code=413, detail="Upload exceeds size limit")
+
+def _temp_path_for(filename: Optional[str]) -> str:
+    """
+    Build a unique temp path so concurrent uploads of the same name never collide
+    and a crafted filename cannot escape Config.TMP_DIR.
+    """
+    safe_name = os.path.basename((filename or "upload").replace("\\", "/"))
+    return os.path.join(Config.TMP_DIR, f"{uuid.uuid4().hex}_{safe_name}")
+
+def _tag_original_names(files: List[UploadFile], results: List[ProcessingResult]) -> List[ProcessingResult]:
+    for file, result in zip(files, results):
+        result.metadata["original_name"] = file.filename
+    return results
+
+async def _persist_uploads(files: List[UploadFile]) -> List[str]:
+    """
+    Save all uploaded files concurrently and return their paths in upload order.
+    """
+    paths = [_temp_path_for(file.filename) for file in files]
+    # Every save is allowed to finish, so when one fails (e.g. 413) none is still writing
+    # as the files already saved beside it are removed
+    outcomes = await asyncio.gather(*[_save_upload(file, path) for file, path in zip(files, paths)], return_exceptions=True)
+    error = next((o for o in outcomes if isinstance(o, BaseException)), None)
+    if error is not None:
+        await _cleanup(paths)
+        raise error
+    return paths
+
+async def _cleanup(paths: List[str]) -> None:
+    """
+    Remove temporary files without blocking the event loop.
+    """
+    async def _remove(path: str):
+        if await aiofiles.os.path.exists(path):
+            await aiofiles.os.remove(path)
+    await asyncio.gather(*[_remove(path) for path in paths])
+
+async def _process_uploads(processor: DocumentProcessor, files: List[UploadFile]) -> List[ProcessingResult]:
+    """
+    Persist uploads to Config.TMP_DIR, process them and remove the temp files.
+    """
+    file_paths = await _persist_uploads(files)
+    try:
+        return _tag_original_names(files, await processor.process_files(file_paths))
+    finally:
+        await _cleanup(file_paths)
+
+def _split_results(results: List[ProcessingResult]) -> Tuple[List[ProcessingResult], List[ProcessingResult]]:
+    return [r for r in results if r.success], [r for r in results if not r.success]
+
+def _session_response(session_id: str, successful: List[ProcessingResult], failed: List[ProcessingResult]) -> SessionResponse:
+    return SessionResponse(
+        session_id=session_id,
+        successful_documents=[r.metadata for r in successful],
+        failed_documents=[{"path": r.metadata.get("original_name") or r.metadata.get("path", "unknown"), "error": r.error_message} for r in failed]
+    )
+
+async def _require_session(session_id: str, session_store: SessionStore) -> None:
+    if not await session_store.get(session_id):
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+
+async def _ingest(session_id: str, results: List[ProcessingResult], ingest_batcher: IngestBatcher) -> SessionResponse:
+    """
+    Queue successfully processed documents for batched ingestion into an existing session.
+    """
+    successful, failed = _split_results(results)
+    if successful:
+        await ingest_batcher.submit(session_id, successful)
+    return _session_response(session_id, successful, failed)
 
 @router.post("/sessions", response_model=SessionResponse)
 async def create_session(
+    request: Request,
     files: List[UploadFile] = File(default=None),
     plain_text: Optional[str] = Form(default=None),
     model_name: str = "llama-3.3-70b-versatile",
     chunk_size: int = 1000,
-    chunk_overlap: int = 200
+    chunk_overlap: int = 200,
+    processor: DocumentProcessor = Depends(get_processor),
+    ingest_semaphore: asyncio.Semaphore = Depends(get_ingest_semaphore),
+    session_store: SessionStore = Depends(get_session_store),
+    rag_cache: RAGCache = Depends(get_rag_cache)
 ):
     """
     Create a new session by processing uploaded files, plain text, or URLs.
     """
+    _check_content_length(request, len(files or []))
     try:
-        # Initialize lists for processing
-        file_paths = []
-        successful = []
-        failed = []
-
-        # Handle plain text input
-        if plain_text:
-            # Create a temporary file for plain text
-            temp_dir = "tmp"
-            os.makedirs(temp_dir, exist_ok=True)
-            temp_path = os.path.join(temp_dir, f"plain_text_{uuid.uuid4()}.txt")
-            with open(temp_path, "w", encoding="utf-8") as f:
-                f.write(plain_text)
-            file_paths.append(temp_path)
-
-        # Handle file uploads
-        if files:
-            temp_dir = "tmp"
-            os.makedirs(temp_dir, exist_ok=True)
-            for file in files:
-                temp_path = os.path.join(temp_dir, file.filename)
-                with open(temp_path, "wb") as f:
-                    f.write(await file.read())
-                file_paths.append(temp_path)
-
-        # Process the files (or plain text saved as a file)
-        if file_paths:
-            results = await processor.process_files(file_paths)
-            successful = [r for r in results if r.success]
-            failed = [r for r in results if not r.success]
-
         # Generate a session ID
         session_id = str(uuid.uuid4())
         
+        index_path = index_path_for(session_id)
+        
         # Initialize RAG system
         rag = RAGSystem(
             session_id=session_id,  # Pass session_id for isolation
             model_name=model_name,
             chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
+            chunk_overlap=chunk_overlap,
+            persist_directory=index_path
         )
         
-        if successful:
-            await rag.ingest_documents(successful)
+        async with ingest_semaphore:
+            results = []
+            # Handle plain text input directly in memory
+            if plain_text:
+                results.append(await processor.process_text(plain_text, {"path": "plain_text", "source": "plain"}))
+            # Handle file uploads
+            if files:
+                results.extend(await _process_uploads(processor, files))
+            successful, failed = _split_results(results)
+            
+            if successful:
+                await rag.ingest_documents(successful)
 
-        # Store session
-        SESSION_MANAGER["sessions"][session_id] = {
-            "rag": rag,
-            "docs": successful,
-            "created_at": datetime.now().isoformat()
-        }
+        # Store session metadata in Redis; the RAG object itself stays in this worker's cache
+        await session_store.create(session_id, {
+            "title": f"Session {session_id[:8]}",
+            "created_at": time.time(),
+            "model_name": model_name,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "index_path": index_path
+        }, successful)
+        rag_cache.put(session_id, rag)
         logger.info(f"Session {session_id} created with {len(successful)} documents")
-
-        # Clean up temporary files
-        for path in file_paths:
-            if os.path.exists(path):
-                os.remove(path)
-
-        return SessionResponse(
-            session_id=session_id,
-            successful_documents=[r.metadata for r in successful],
-            failed_documents=[{"path": r.metadata.get("path", "unknown"), "error": r.error_message} for r in failed]
-        )
+        return _session_response(session_id, successful, failed)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Session creation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/sessions/{session_id}/query", response_model=QueryResponse)
-async def query_session(session_id: str, request: QueryRequest):
+async def query_session(
+    session_id: str,
+    request: QueryRequest,
+    stream: bool = False,
+    session_store: SessionStore = Depends(get_session_store),
+    rag_cache: RAGCache = Depends(get_rag_cache)
+):
     """
     Query the documents in a session with a question.
+    Pass `?stream=true` to receive the answer as a plain-text stream.
     """
-    session = SESSION_MANAGER["sessions"].get(session_id)
+    session = await session_store.get(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
     try:
-        answer = await session["rag"].query(request.query)
-        return QueryResponse(answer=answer)
+        rag = await rag_cache.get(session_id, session)
+        if stream:
+            return StreamingResponse(rag.query_stream(request.query), media_type="text/plain")
+        answer = await rag.query(request.query)
+        return ORJSONResponse(QueryResponse(answer=answer))
     except Exception as e:
         logger.error(f"Query failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/sessions/{session_id}/podcast", response_model=PodcastResponse)
-async def create_podcast(session_id: str, request: PodcastRequest):
+async def create_podcast(
+    session_id: str,
+    request: PodcastRequest,
+    podcast_processor: PodcastProcessor = Depends(get_podcast_processor),
+    session_store: SessionStore = Depends(get_session_store),
+    rag_cache: RAGCache = Depends(get_rag_cache)
+):
     """
     Generate a podcast from session documents based on a topic.
     """
-    session = SESSION_MANAGER["sessions"].get(session_id)
-    if not session or not session["docs"]:
+    session = await session_store.get(session_id)
+    if not session or not int(session["document_count"]):
         raise HTTPException(status_code=404, detail="Session not found or no documents")
     
     try:
-        content = await session["rag"].query(request.topic)
+        rag = await rag_cache.get(session_id, session)
+        content = await rag.query(request.topic)
         transcript = await podcast_processor.process_podcast(content)
-        audio_url = podcast_processor.generate_audio(transcript, request.voice1, request.voice2)
-        return PodcastResponse(transcript=transcript, audio_url=audio_url)
+        audio_url = await podcast_processor.generate_audio(transcript, request.voice1, request.voice2)
+        return ORJSONResponse(PodcastResponse(transcript=transcript, audio_url=audio_url))
     except Exception as e:
         logger.error(f"Podcast generation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/sessions/{session_id}/model", response_model=ModelSwitchResponse)
-async def switch_model(session_id: str, request: ModelSwitchRequest):
+async def switch_model(
+    session_id: str,
+    request: ModelSwitchRequest,
+    model_manager: ModelManager = Depends(get_model_manager),
+    session_store: SessionStore = Depends(get_session_store),
+    rag_cache: RAGCache = Depends(get_rag_cache)
+):
     """
     Switch the model used in an existing session.
     """
-    session = SESSION_MANAGER["sessions"].get(session_id)
+    session = await session_store.get(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
@@ -147,14 +288,10 @@ async def switch_model(session_id: str, request: ModelSwitchRequest):
         raise HTTPException(status_code=400, detail=f"Model {request.model_name} not found")
     
     try:
-        new_rag = RAGSystem(
-            session_id=session_id,  
-            model_name=request.model_name,
-            chunk_size=1000,
-            chunk_overlap=200
-        )
-        await new_rag.ingest_documents(session["docs"])
-        session["rag"] = new_rag
+        # Embeddings do not depend on the chat model, so keep the existing index
+        rag = await rag_cache.get(session_id, session)
+        rag_cache.put(session_id, RAGSystem(session_id=session_id, model_name=request.model_name, index=rag.index))
+        await session_store.set_model(session_id, request.model_name)
         logger.info(f"Session {session_id} switched to model {request.model_name}")
         return ModelSwitchResponse(message=f"Switched to {request.model_name}")
     except Exception as e:
@@ -162,64 +299,46 @@ async def switch_model(session_id: str, request: ModelSwitchRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/sessions/{session_id}/info")
-async def get_session_info(session_id: str):
+async def get_session_info(
+    session_id: str,
+    session_store: SessionStore = Depends(get_session_store),
+    rag_cache: RAGCache = Depends(get_rag_cache)
+):
     """
     Get information about ingested documents in a session.
     """
-    session = SESSION_MANAGER["sessions"].get(session_id)
+    session = await session_store.get(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    return {"ingested_documents": session["rag"].get_ingested_documents_info()}
+    rag = await rag_cache.get(session_id, session)
+    return {"ingested_documents": rag.get_ingested_documents_info()}
 
 @router.get("/sessions")
-async def list_sessions():
+async def list_sessions(session_store: SessionStore = Depends(get_session_store)):
     try:
-        sessions_list = []
-        for session_id, session_data in SESSION_MANAGER["sessions"].items():
-            if session_data:
-                # Safely get model name without relying on specific attributes
-                model_name = "unknown"
-                try:
-                    if session_data.get("rag"):
-                        # Try different ways to get model name
-                        if hasattr(session_data["rag"], "model_manager") and hasattr(session_data["rag"].model_manager, "model_name"):
-                            model_name = session_data["rag"].model_manager.model_name
-                        elif hasattr(session_data["rag"], "model_name"):
-                            model_name = session_data["rag"].model_name
-                except Exception as e:
-                    logger.error(f"Error getting model name: {str(e)}")
-                
-                # Get document count safely
-                doc_count = 0
-                if "docs" in session_data:
-                    doc_count = len(session_data["docs"])
-                elif "documents" in session_data:
-                    doc_count = len(session_data["documents"])
-                
-                sessions_list.append({
-                    "id": session_id,
-                    "title": session_data.get("title", f"Session {session_id[:8]}"),
-                    "document_count": doc_count,
-                    "model_name": model_name,
-                    "created_at": session_data.get("created_at", "unknown")
-                })
-        return {"sessions": sessions_list}
+        return {"sessions": await session_store.list()}
     except Exception as e:
         logger.error(f"Error listing sessions: {str(e)}")
         return {"sessions": []}
 
 @router.delete("/sessions/{session_id}")
-async def delete_session(session_id: str):
+async def delete_session(
+    session_id: str,
+    session_store: SessionStore = Depends(get_session_store),
+    rag_cache: RAGCache = Depends(get_rag_cache)
+):
     """
     Delete a session and its associated data.
     """
-    if session_id in SESSION_MANAGER["sessions"]:
-        del SESSION_MANAGER["sessions"][session_id]
+    session = await session_store.delete(session_id)
+    rag_cache.pop(session_id)
+    if session:
+        await remove_index(session_id, session["index_path"])
         logger.info(f"Session {session_id} deleted")
     return {"message": "Session deleted"}
 
 @router.get("/models")
-async def list_models():
+async def list_models(model_manager: ModelManager = Depends(get_model_manager)):
     """
     List available models and their details.
     """
@@ -227,59 +346,25 @@ async def list_models():
 
 @router.post("/sessions/{session_id}/upload", response_model=SessionResponse)
 async def upload_to_session(
+    request: Request,
     session_id: str,
-    files: List[UploadFile] = File(...)
+    files: List[UploadFile] = File(...),
+    processor: DocumentProcessor = Depends(get_processor),
+    ingest_semaphore: asyncio.Semaphore = Depends(get_ingest_semaphore),
+    ingest_batcher: IngestBatcher = Depends(get_ingest_batcher),
+    session_store: SessionStore = Depends(get_session_store)
 ):
     """
     Upload additional files to an existing session.
     """
+    _check_content_length(request, len(files))
     try:
-        if session_id not in SESSION_MANAGER["sessions"]:
-            raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
-        
-        # Get the existing session
-        session = SESSION_MANAGER["sessions"][session_id]
-        rag = session["rag"]
-        
-        # Process files
-        file_paths = []
-        successful = []
-        failed = []
-        
-        # Save uploaded files
-        for uploaded_file in files:
-            temp_dir = "tmp"
-            os.makedirs(temp_dir, exist_ok=True)
-            file_path = os.path.join(temp_dir, uploaded_file.filename)
-            
-            with open(file_path, "wb") as f:
-                content = await uploaded_file.read()
-                f.write(content)
-            
-            file_paths.append(file_path)
-        
-        # Process the files
-        results = await processor.process_files(file_paths)
-        successful = [r for r in results if r.success]
-        failed = [r for r in results if not r.success]
-        
-        # Add documents to the RAG system if any were successfully processed
-        if successful:
-            await rag.ingest_documents(successful)
-            
-            # Update session with new documents
-            session["docs"].extend(successful)
-        
-        # Clean up temporary files
-        for path in file_paths:
-            if os.path.exists(path):
-                os.remove(path)
-        
-        return SessionResponse(
-            session_id=session_id,
-            successful_documents=[r.metadata for r in successful],
-            failed_documents=[{"path": r.metadata.get("path", "unknown"), "error": r.error_message} for r in failed]
-        )
+        await _require_session(session_id, session_store)
+        async with ingest_semaphore:
+            results = await _process_uploads(processor, files)
+        return await _ingest(session_id, results, ingest_batcher)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Upload to session failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -287,47 +372,20 @@ async def upload_to_session(
 @router.post("/sessions/upload-text", response_model=SessionResponse)
 async def upload_text(
     text: str = Form(...),
-    session_id: str = Form(...)
+    session_id: str = Form(...),
+    processor: DocumentProcessor = Depends(get_processor),
+    ingest_batcher: IngestBatcher = Depends(get_ingest_batcher),
+    session_store: SessionStore = Depends(get_session_store)
 ):
     """
     Upload plain text to an existing session.
     """
     try:
-        if session_id not in SESSION_MANAGER["sessions"]:
-            raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
-        
-        # Get the existing session
-        session = SESSION_MANAGER["sessions"][session_id]
-        rag = session["rag"]
-        
-        # Create a temporary file for plain text
-        temp_dir = "tmp"
-        os.makedirs(temp_dir, exist_ok=True)
-        temp_path = os.path.join(temp_dir, f"plain_text_{uuid.uuid4()}.txt")
-        with open(temp_path, "w", encoding="utf-8") as f:
-            f.write(text)
-        
-        # Process the text file
-        results = await processor.process_files([temp_path])
-        successful = [r for r in results if r.success]
-        failed = [r for r in results if not r.success]
-        
-        # Add documents to the RAG system if any were successfully processed
-        if successful:
-            await rag.ingest_documents(successful)
-            
-            # Update session with new documents
-            session["docs"].extend(successful)
-        
-        # Clean up temporary file
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-        
-        return SessionResponse(
-            session_id=session_id,
-            successful_documents=[r.metadata for r in successful],
-            failed_documents=[{"path": r.metadata.get("path", "unknown"), "error": r.error_message} for r in failed]
-        )
+        await _require_session(session_id, session_store)
+        result = await processor.process_text(text, {"path": "plain_text", "source": "plain", "session": session_id})
+        return await _ingest(session_id, [result], ingest_batcher)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Upload text to session failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -335,49 +393,23 @@ async def upload_text(
 @router.post("/sessions/upload-url", response_model=SessionResponse)
 async def upload_url(
     url: str = Form(...),
-    session_id: str = Form(...)
+    session_id: str = Form(...),
+    processor: DocumentProcessor = Depends(get_processor),
+    ingest_batcher: IngestBatcher = Depends(get_ingest_batcher),
+    session_store: SessionStore = Depends(get_session_store)
 ):
     """
     Upload content from a URL to an existing session.
     """
     try:
-        if session_id not in SESSION_MANAGER["sessions"]:
-            raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
-        
-        # Get the existing session
-        session = SESSION_MANAGER["sessions"][session_id]
-        rag = session["rag"]
-        
+        await _require_session(session_id, session_store)
         # TODO: Implement URL fetching and processing
         # For now, just store the URL as a text document
-        temp_dir = "tmp"
-        os.makedirs(temp_dir, exist_ok=True)
-        temp_path = os.path.join(temp_dir, f"url_{uuid.uuid4()}.txt")
-        with open(temp_path, "w", encoding="utf-8") as f:
-            f.write(f"URL: {url}\n\n")
-            f.write("Content would be fetched and processed in a production environment.")
-        
-        # Process the URL file
-        results = await processor.process_files([temp_path])
-        successful = [r for r in results if r.success]
-        failed = [r for r in results if not r.success]
-        
-        # Add documents to the RAG system if any were successfully processed
-        if successful:
-            await rag.ingest_documents(successful)
-            
-            # Update session with new documents
-            session["docs"].extend(successful)
-        
-        # Clean up temporary file
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-        
-        return SessionResponse(
-            session_id=session_id,
-            successful_documents=[r.metadata for r in successful],
-            failed_documents=[{"path": r.metadata.get("path", "unknown"), "error": r.error_message} for r in failed]
-        )
+        text = f"URL: {url}\n\nContent would be fetched and processed in a production environment."
+        result = await processor.process_text(text, {"path": url, "source": "url", "session": session_id})
+        return await _ingest(session_id, [result], ingest_batcher)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Upload URL to session failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
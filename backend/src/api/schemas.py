@@ -1,32 +1,43 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict, Any
+from typing_extensions import TypedDict
+
+# Request models are immutable and ignore unknown fields, which keeps pydantic-core on its fast path
+REQUEST_CONFIG = ConfigDict(extra="ignore", frozen=True)
 
 class ProcessRequest(BaseModel):
+    model_config = REQUEST_CONFIG
     file_paths: List[str]
     model_name: Optional[str] = "llama-3.3-70b-versatile"
 
 class SessionResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
     session_id: str
     successful_documents: List[Dict[str, Any]]
     failed_documents: List[Dict[str, str]]
 
 class QueryRequest(BaseModel):
+    model_config = REQUEST_CONFIG
     query: str
 
-class QueryResponse(BaseModel):
+# Outbound-only payloads are plain dicts returned through ORJSONResponse, so no validator runs
+class QueryResponse(TypedDict):
     answer: str
 
 class PodcastRequest(BaseModel):
+    model_config = REQUEST_CONFIG
     topic: str
     voice1: str
     voice2: str
 
-class PodcastResponse(BaseModel):
+class PodcastResponse(TypedDict):
     transcript: str
     audio_url: str
 
 class ModelSwitchRequest(BaseModel):
+    model_config = REQUEST_CONFIG
     model_name: str
 
 class ModelSwitchResponse(BaseModel):
-    message: str
\ No newline at end of file
+    model_config = ConfigDict(frozen=True)
+    message: str
@@ -11,6 +11,27 @@ class Config:
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     TMP_DIR = "tmp"
+    VECTOR_STORE_DIR = "vector_store"
+    CORS_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",") if origin.strip()]
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "embedding_cache")
+    QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096"))  # question embeddings kept in memory per worker
+    FAISS_INDEX_FACTORY = os.getenv("FAISS_INDEX_FACTORY", "HNSW32,SQ8")  # faiss.index_factory description for new indexes
+    FAISS_TRAIN_SIZE = int(os.getenv("FAISS_TRAIN_SIZE", "1000"))  # vectors needed before a FAISS_INDEX_FACTORY that requires training is built
+    VECTOR_STORE = os.getenv("VECTOR_STORE", "faiss")  # "faiss" (per-worker files) or "milvus" (shared server)
+    MILVUS_URI = os.getenv("MILVUS_URI", "http://localhost:19530")
+    RAG_CACHE_SIZE = int(os.getenv("RAG_CACHE_SIZE", "32"))
+    MAX_CONCURRENT_INGEST = int(os.getenv("MAX_CONCURRENT_INGEST", "4"))
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "32"))
+    INGEST_BATCH_DELAY = float(os.getenv("INGEST_BATCH_DELAY", "0.1"))  # seconds
+    INGEST_LOCK_TIMEOUT = int(os.getenv("INGEST_LOCK_TIMEOUT", "600"))  # seconds a session's index write lock is held at most
+    TMP_SWEEP_INTERVAL = int(os.getenv("TMP_SWEEP_INTERVAL", "300"))  # seconds
+    TMP_MAX_AGE = int(os.getenv("TMP_MAX_AGE", "1800"))  # seconds
+    # Send several audio/image inputs per HF request; only enable for endpoints that accept list inputs
+    INFERENCE_BATCHING = os.getenv("INFERENCE_BATCHING", "false").lower() in ("1", "true", "yes")
+    INFERENCE_BATCH_SIZE = int(os.getenv("INFERENCE_BATCH_SIZE", "8"))  # files per batched HF request
+    INFERENCE_BATCH_MAX_BYTES = int(os.getenv("INFERENCE_BATCH_MAX_BYTES", str(16 * 1024 * 1024)))  # raw input bytes per batched request
+    PODCAST_MAX_WAIT = int(os.getenv("PODCAST_MAX_WAIT", "900"))  # seconds
     MAX_FILE_SIZE = 25 * 1024 * 1024  # 25MB
     MAX_AUDIO_LENGTH = 300  # 5 minutes
 
@@ -19,4 +40,6 @@ class Config:
         required = ["HF_API_KEY", "GROQ_API_KEY", "PODCAST_USER_ID", "PODCAST_SECRET_KEY", "GOOGLE_API_KEY"]
         missing = [key for key in required if not getattr(Config, key)]
         if missing:
-            raise ValueError(f"Missing environment variables: {', '.join(missing)}")
\ No newline at end of file
+            raise ValueError(f"Missing environment variables: {', '.join(missing)}")
+        if Config.VECTOR_STORE not in ("faiss", "milvus"):
+            raise ValueError(f"Unknown VECTOR_STORE: {Config.VECTOR_STORE} (expected \"faiss\" or \"milvus\")")
\ No newline at end of file
@@ -1,17 +1,152 @@
 import os
 import asyncio
+import base64
 import mimetypes
-from typing import List, Dict, Any
+import threading
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import Executor
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from docling.document_converter import DocumentConverter
-from moviepy.editor import VideoFileClip
+import hashlib
 import aiohttp
+import orjson
+import aiofiles
+import aiofiles.os
+import numpy as np
 from crawl4ai import AsyncWebCrawler
 from crawl4ai.async_configs import BrowserConfig, CrawlerRunConfig
 from urllib.parse import urlparse
 from src.core.config import Config
+from src.core import vad
 from src.utils.logging import logger
 from pydantic import BaseModel
 
+try:
+    from blake3 import blake3 as _content_hash
+except ImportError:  # optional: BLAKE2 from the stdlib is slower but fine for cache keys
+    _content_hash = hashlib.blake2b
+
+# Loaded once at import instead of lazily on the first guess_type call
+mimetypes.init()
+
+# Extensions we handle, resolved with one dict lookup before falling back to the system mime database
+MIME_MAP: Dict[str, str] = {
+    ".txt": "text/plain",
+    ".md": "text/markdown",
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+    ".mp4": "video/mp4",
+    ".avi": "video/x-msvideo",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".pdf": "application/pdf",
+    ".csv": "text/csv",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".ppt": "application/vnd.ms-powerpoint",
+    ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    ".xls": "application/vnd.ms-excel",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+}
+
+# Converter owned by the current process; parse-pool workers each build their own on first use
+_CONVERTER: Optional[DocumentConverter] = None
+# Guards construction when conversions run on the default thread pool instead of the process pool
+_CONVERTER_LOCK = threading.Lock()
+
+def _get_converter() -> DocumentConverter:
+    global _CONVERTER
+    if _CONVERTER is None:
+        with _CONVERTER_LOCK:
+            if _CONVERTER is None:
+                _CONVERTER = DocumentConverter()
+    return _CONVERTER
+
+def init_parse_worker():
+    """
+    Process pool initializer: load docling's pipeline when the worker starts instead of on its first document.
+    """
+    _get_converter()
+
+def _convert_document(file_path: str) -> str:
+    """
+    Run docling on a single file. Module-level so it can be dispatched to a process pool.
+    """
+    return _get_converter().convert(file_path).text
+
+def _extract_pptx_text(file_path: str) -> str:
+    """
+    Collect the text of every shape in a presentation. Module-level for the process pool.
+    """
+    from pptx import Presentation
+    prs = Presentation(file_path)
+    text = []
+    for slide in prs.slides:
+        for shape in slide.shapes:
+            if hasattr(shape, "text"):
+                text.append(shape.text)
+    return "\n".join(text)
+
+STREAM_CHUNK_SIZE = 1 << 20  # 1MB
+RESULT_CACHE_SIZE = 512
+# Uncompressed uploads above this size are re-encoded to Opus before being sent for transcription
+COMPRESS_MIN_SIZE = 1 << 20  # 1MB
+PCM_MIME_TYPES = {"audio/wav", "audio/x-wav", "audio/wave"}
+
+def _hash_file(file_path: str) -> str:
+    h = _content_hash()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(STREAM_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
+async def _stream_file(file_path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Yield a file in chunks so request bodies are never fully buffered in memory.
+    """
+    async with aiofiles.open(file_path, "rb") as f:
+        while chunk := await f.read(chunk_size):
+            yield chunk
+
+def _opus_command(file_path: str) -> List[str]:
+    # 16 kHz mono Opus in an Ogg container: what Whisper resamples to anyway, at a fraction of PCM's size
+    return [
+        "ffmpeg", "-nostdin", "-i", file_path, "-vn", "-ac", "1", "-ar", "16000",
+        "-c:a", "libopus", "-b:a", "24k", "-f", "ogg", "pipe:1"
+    ]
+
+def _size_groups(sizes: List[int], max_count: int, max_bytes: int) -> List[List[int]]:
+    """
+    Split indices into consecutive groups of at most `max_count` items and `max_bytes` in total;
+    an item larger than `max_bytes` gets a group of its own.
+    """
+    groups, current, total = [], [], 0
+    for i, size in enumerate(sizes):
+        if current and (len(current) == max_count or total + size > max_bytes):
+            groups.append(current)
+            current, total = [], 0
+        current.append(i)
+        total += size
+    if current:
+        groups.append(current)
+    return groups
+
+def _join_transcript(texts) -> str:
+    return " ".join(text.strip() for text in texts if text)
+
+async def _iter_stream(reader: asyncio.StreamReader, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Adapt a subprocess pipe to an async iterator aiohttp can send as a chunked request body.
+    """
+    while chunk := await reader.read(chunk_size):
+        yield chunk
+
+WHISPER_API_URL = "https://api-inference.huggingface.co/models/openai/whisper-large-v3-turbo"
+CAPTION_API_URL = "https://api-inference.huggingface.co/models/Salesforce/blip-image-captioning-large"
+
 class ProcessingResult(BaseModel):
     success: bool
     content: str
@@ -19,10 +154,15 @@ class ProcessingResult(BaseModel):
     error_message: str = ""
 
 class DocumentProcessor:
-    def __init__(self):
+    def __init__(self, executor: Optional[Executor] = None):
         Config.validate()
         self.headers = {"Authorization": f"Bearer {Config.HF_API_KEY}"}
-        self.converter = DocumentConverter()
+        # CPU-bound parsing runs here; None falls back to the event loop's default thread pool
+        self.executor = executor
+        # Shared HTTP session (created lazily inside the running loop) so inference calls reuse keep-alive connections
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Transcriptions and captions keyed by content hash, so re-uploads skip the inference call
+        self._result_cache: "OrderedDict[str, ProcessingResult]" = OrderedDict()
         self.browser_config = BrowserConfig(verbose=False)
         self.crawler_run_config = CrawlerRunConfig(
             word_count_threshold=50,
@@ -31,9 +171,85 @@ class DocumentProcessor:
         )
         os.makedirs(Config.TMP_DIR, exist_ok=True)
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=32, limit_per_host=16, keepalive_timeout=75)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=120),
+                json_serialize=lambda obj: orjson.dumps(obj).decode()
+            )
+        return self._session
+
+    async def aclose(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
     async def process_files(self, file_paths: List[str]) -> List[ProcessingResult]:
-        tasks = [self.process_file(path) for path in file_paths]
-        return await asyncio.gather(*tasks)
+        """
+        Process files concurrently. With Config.INFERENCE_BATCHING, local audio and image files
+        are sent to inference in batches capped by count and total bytes.
+        """
+        audio, images, others = [], [], []
+        kinds = await asyncio.gather(*[self._batch_kind(path) for path in file_paths])
+        # Sizes found while classifying are passed on, so no file is stat'ed twice
+        sizes = [size for _, size in kinds]
+        for i, (kind, _) in enumerate(kinds):
+            (audio if kind == "audio" else images if kind == "image" else others).append(i)
+
+        async def single(i: int) -> List[ProcessingResult]:
+            return [await self.process_file(file_paths[i], sizes[i])]
+
+        groups, tasks = [], []
+        for indices, handler in ((audio, self._process_audio_batch), (images, self._process_image_batch)):
+            if not Config.INFERENCE_BATCHING:
+                others += indices
+                continue
+            for group in _size_groups([sizes[i] for i in indices], Config.INFERENCE_BATCH_SIZE, Config.INFERENCE_BATCH_MAX_BYTES):
+                group = [indices[j] for j in group]
+                # A batch of one gains nothing over the streamed single-file request
+                if len(group) == 1:
+                    others += group
+                    continue
+                groups.append(group)
+                tasks.append(handler([file_paths[i] for i in group], [sizes[i] for i in group]))
+        groups += [[i] for i in others]
+        tasks += [single(i) for i in others]
+
+        # Put results back in the order the paths were given
+        results: List[Optional[ProcessingResult]] = [None] * len(file_paths)
+        for group, batch in zip(groups, await asyncio.gather(*tasks)):
+            for i, result in zip(group, batch):
+                results[i] = result
+        return results
+
+    async def _batch_kind(self, path: str) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Return the batch a path belongs to ("audio", "image" or None) and its size, if it was stat'ed.
+        """
+        if urlparse(path).scheme in ("http", "https"):
+            return None, None
+        mime_type = self._get_mime_type(path) or ""
+        kind = "audio" if mime_type.startswith("audio/") else "image" if mime_type.startswith("image/") else None
+        # Only batchable files are stat'ed here; the rest are checked once in process_file
+        if kind is None:
+            return None, None
+        try:
+            size = (await aiofiles.os.stat(path)).st_size
+        except OSError:
+            return None, None
+        return (kind if size <= Config.MAX_FILE_SIZE else None), size
+
+    async def process_text(self, text: str, metadata: Dict[str, Any] = None) -> ProcessingResult:
+        """
+        Ingest text that is already in memory without a temporary file round-trip.
+        """
+        return ProcessingResult(
+            success=True,
+            content=text,
+            metadata={"type": "text", **(metadata or {})}
+        )
 
     def _is_supported_file_type(self, mime_type: str) -> bool:
         supported_types = {
@@ -51,15 +267,21 @@ class DocumentProcessor:
         }
         return mime_type in supported_types or mime_type.startswith(("audio/", "video/", "image/"))
 
-    async def process_file(self, file_path: str) -> ProcessingResult:
+    async def process_file(self, file_path: str, size: Optional[int] = None) -> ProcessingResult:
+        """
+        Process one file or URL. `size` skips the stat when the caller already has it.
+        """
         try:
             if urlparse(file_path).scheme in ("http", "https"):
                 return await self._process_url(file_path)
             
-            if not os.path.exists(file_path):
-                return ProcessingResult(success=False, content="", error_message=f"File not found: {file_path}")
+            if size is None:
+                try:
+                    size = (await aiofiles.os.stat(file_path)).st_size
+                except FileNotFoundError:
+                    return ProcessingResult(success=False, content="", error_message=f"File not found: {file_path}")
             
-            if not self._check_file_size(file_path):
+            if size > Config.MAX_FILE_SIZE:
                 return ProcessingResult(success=False, content="", error_message=f"File {file_path} exceeds size limit")
             
             mime_type = self._get_mime_type(file_path)
@@ -71,39 +293,31 @@ class DocumentProcessor:
             
             logger.info(f"Processing {file_path} ({mime_type})")
             if mime_type.startswith("audio/"):
-                return await self._process_audio(file_path)
+                return await self._process_audio(file_path, size)
             elif mime_type.startswith("video/"):
                 return await self._process_video(file_path)
             elif mime_type.startswith("image/"):
-                return await self._process_image(file_path)
+                return await self._process_image(file_path, size)
             elif mime_type == "text/plain":
                 # Handle plain text directly
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
+                async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
+                    content = await f.read()
                 return ProcessingResult(
                     success=True,
                     content=content,
                     metadata={"type": "text", "path": file_path}
                 )
             else:
-                return self._process_document(file_path)
+                return await self._process_document(file_path, mime_type)
         except Exception as e:
             logger.error(f"Error processing {file_path}: {str(e)}")
             return ProcessingResult(success=False, content="", error_message=str(e))
 
-    def _process_document(self, file_path: str) -> ProcessingResult:
+    async def _process_document(self, file_path: str, mime_type: str) -> ProcessingResult:
         try:
-            mime_type = self._get_mime_type(file_path)
             if mime_type in ("application/vnd.ms-powerpoint", "application/vnd.openxmlformats-officedocument.presentationml.presentation"):
                 try:
-                    from pptx import Presentation
-                    prs = Presentation(file_path)
-                    text = []
-                    for slide in prs.slides:
-                        for shape in slide.shapes:
-                            if hasattr(shape, "text"):
-                                text.append(shape.text)
-                    content = "\n".join(text)
+                    content = await asyncio.get_running_loop().run_in_executor(self.executor, _extract_pptx_text, file_path)
                     return ProcessingResult(
                         success=True,
                         content=content,
@@ -112,10 +326,10 @@ class DocumentProcessor:
                 except ImportError:
                     return ProcessingResult(success=False, content="", error_message="PPTX processing requires python-pptx library")
             
-            result = self.converter.convert(file_path)
+            content = await asyncio.get_running_loop().run_in_executor(self.executor, _convert_document, file_path)
             return ProcessingResult(
                 success=True,
-                content=result.text,
+                content=content,
                 metadata={"type": "document", "path": file_path}
             )
         except Exception as e:
@@ -135,92 +349,282 @@ class DocumentProcessor:
         except Exception as e:
             return ProcessingResult(success=False, content="", error_message=str(e))
 
+    async def _probe_duration(self, file_path: str) -> float:
+        """
+        Read the container duration with ffprobe instead of decoding the media.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            "ffprobe", "-v", "error", "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1", file_path,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+        out, _ = await proc.communicate()
+        if proc.returncode != 0:
+            raise ValueError(f"Could not read duration of {file_path}")
+        return float(out.strip())
+
+    async def _transcribe(self, body, headers: Optional[Dict[str, str]] = None) -> str:
+        transcription = await self._request_transcription(body, headers)
+        if not transcription:
+            raise ValueError("No transcription received")
+        return transcription
+
+    async def _request_transcription(self, body, headers: Optional[Dict[str, str]] = None) -> str:
+        session = await self._get_session()
+        async with session.post(WHISPER_API_URL, data=body, headers=headers) as resp:
+            result = orjson.loads(await resp.read())
+        return result.get("text", "")
+
+    async def _decode_pcm(self, file_path: str) -> np.ndarray:
+        """
+        Decode any audio ffmpeg understands to 16 kHz mono float32 samples.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-nostdin", "-i", file_path, "-vn", "-ac", "1", "-ar", str(vad.SAMPLE_RATE), "-f", "f32le", "pipe:1",
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+        out, _ = await proc.communicate()
+        if proc.returncode != 0:
+            raise ValueError(f"Could not decode audio in {file_path}")
+        return np.frombuffer(out, dtype=np.float32)
+
+    async def _speech_windows(self, file_path: str) -> Optional[List[bytes]]:
+        """
+        Decode a file and cut its speech into WAV windows with VAD, dropping silence.
+        Returns None if VAD is unusable, so the caller sends the whole file instead.
+        """
+        audio = await self._decode_pcm(file_path)
+        windows = await asyncio.to_thread(vad.speech_windows, audio)
+        if windows is None:
+            return None
+        return [vad.to_wav(w) for w in windows]
+
+    async def _transcribe_windows(self, windows: List[bytes]) -> List[str]:
+        """
+        Transcribe WAV windows as one batched request, one text per window in order.
+        A window may come back empty (e.g. a cough VAD took for speech); callers check the joined text.
+        """
+        if len(windows) == 1 or not Config.INFERENCE_BATCHING:
+            return await self._transcribe_each(windows)
+        try:
+            outputs = await self._infer_batch(WHISPER_API_URL, windows)
+            return [output.get("text", "") for output in outputs]
+        except Exception as e:
+            logger.error(f"Batched transcription failed, retrying per window: {str(e)}")
+            return await self._transcribe_each(windows)
+
+    async def _transcribe_each(self, windows: List[bytes]) -> List[str]:
+        return await asyncio.gather(*[self._request_transcription(w, headers={"Content-Type": "audio/wav"}) for w in windows])
+
+    async def _transcribe_speech(self, file_path: str) -> Optional[str]:
+        """
+        Transcribe only the speech in a file, joining the windows back in order.
+        Returns None if VAD is unusable.
+        """
+        windows = await self._speech_windows(file_path)
+        if windows is None:
+            return None
+        if not windows:
+            raise ValueError("No speech detected")
+        transcription = _join_transcript(await self._transcribe_windows(windows))
+        if not transcription:
+            raise ValueError("No transcription received")
+        return transcription
+
+    async def _transcribe_file(self, file_path: str, size: int) -> str:
+        if vad.is_available():
+            transcription = await self._transcribe_speech(file_path)
+            if transcription is not None:
+                return transcription
+        if size > COMPRESS_MIN_SIZE and self._get_mime_type(file_path) in PCM_MIME_TYPES:
+            return await self._transcribe_compressed(file_path)
+        return await self._transcribe(_stream_file(file_path), headers={"Content-Length": str(size)})
+
+    async def _transcribe_compressed(self, file_path: str) -> str:
+        """
+        Encode the audio track as 16 kHz mono Opus and stream it straight into the Whisper request,
+        which is far smaller on the wire than PCM.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *_opus_command(file_path),
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            return await self._transcribe(_iter_stream(proc.stdout), headers={"Content-Type": "audio/ogg"})
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+            await proc.wait()
+
     async def _process_video(self, file_path: str) -> ProcessingResult:
         try:
-            video = VideoFileClip(file_path)
-            if video.duration > Config.MAX_AUDIO_LENGTH:
-                video.close()
+            if await self._probe_duration(file_path) > Config.MAX_AUDIO_LENGTH:
                 return ProcessingResult(success=False, content="", error_message=f"Video exceeds {Config.MAX_AUDIO_LENGTH}s")
             
-            temp_audio = os.path.join(Config.TMP_DIR, f"temp_{os.path.basename(file_path)}.wav")
-            video.audio.write_audiofile(temp_audio, logger=None)
-            result = await self._process_audio(temp_audio)
-            video.close()
-            os.unlink(temp_audio)
+            transcription = await self._transcribe_compressed(file_path)
             return ProcessingResult(
-                success=result.success,
-                content=f"Video transcription:\n{result.content}",
-                metadata={"type": "video", "path": file_path},
-                error_message=result.error_message
+                success=True,
+                content=f"Video transcription:\n{transcription}",
+                metadata={"type": "video", "path": file_path}
             )
         except Exception as e:
             return ProcessingResult(success=False, content="", error_message=str(e))
 
-    async def _process_audio(self, file_path: str) -> ProcessingResult:
-        API_URL = "https://api-inference.huggingface.co/models/openai/whisper-large-v3-turbo"
+    async def _content_key(self, kind: str, file_path: str) -> str:
+        return f"{kind}:{await asyncio.to_thread(_hash_file, file_path)}"
+
+    def _cache_get(self, key: str, file_path: str) -> Optional[ProcessingResult]:
+        result = self._result_cache.get(key)
+        if result is None:
+            return None
+        self._result_cache.move_to_end(key)
+        return result.model_copy(update={"metadata": {**result.metadata, "path": file_path}})
+
+    def _cache_put(self, key: str, result: ProcessingResult):
+        # Callers go on to tag the result they return (e.g. original_name); the cache keeps its own copy
+        self._result_cache[key] = result.model_copy(deep=True)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+
+    async def _process_audio(self, file_path: str, size: int) -> ProcessingResult:
         try:
-            if os.path.getsize(file_path) > Config.MAX_FILE_SIZE:
+            if size > Config.MAX_FILE_SIZE:
                 return ProcessingResult(success=False, content="", error_message="Audio file too large")
             
-            with open(file_path, "rb") as f:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(API_URL, headers=self.headers, data=f) as resp:
-                        result = await resp.json()
-                        transcription = result.get("text", "")
-                        if not transcription:
-                            raise ValueError("No transcription received")
-                        return ProcessingResult(
-                            success=True,
-                            content=transcription,
-                            metadata={"type": "audio", "path": file_path}
-                        )
+            key = await self._content_key("audio", file_path)
+            cached = self._cache_get(key, file_path)
+            if cached is not None:
+                return cached
+            
+            transcription = await self._transcribe_file(file_path, size)
+            result = ProcessingResult(
+                success=True,
+                content=transcription,
+                metadata={"type": "audio", "path": file_path}
+            )
+            self._cache_put(key, result)
+            return result
         except Exception as e:
             return ProcessingResult(success=False, content="", error_message=str(e))
 
-    async def _process_image(self, file_path: str) -> ProcessingResult:
-        API_URL = "https://api-inference.huggingface.co/models/Salesforce/blip-image-captioning-large"
+    async def _read_files(self, file_paths: List[str]) -> List[bytes]:
+        return await asyncio.gather(*[self._read_file(path) for path in file_paths])
+
+    async def _read_file(self, file_path: str) -> bytes:
+        async with aiofiles.open(file_path, "rb") as f:
+            return await f.read()
+
+    async def _encode_opus(self, file_path: str) -> bytes:
+        proc = await asyncio.create_subprocess_exec(
+            *_opus_command(file_path),
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+        out, _ = await proc.communicate()
+        if proc.returncode != 0:
+            raise ValueError(f"Could not encode audio in {file_path}")
+        return out
+
+    async def _audio_payload(self, file_path: str, size: int) -> bytes:
+        # Same size/format rule as the single-file path: large PCM goes out as Opus
+        if size > COMPRESS_MIN_SIZE and self._get_mime_type(file_path) in PCM_MIME_TYPES:
+            return await self._encode_opus(file_path)
+        return await self._read_file(file_path)
+
+    async def _infer_batch(self, api_url: str, payloads: List[bytes]) -> List[Any]:
+        """
+        Send inputs as base64 `inputs` lists and return one output per input. Inputs are split
+        across requests so none carries more than Config.INFERENCE_BATCH_MAX_BYTES of raw data.
+        """
+        session = await self._get_session()
+        outputs = []
+        for group in _size_groups([len(p) for p in payloads], len(payloads), Config.INFERENCE_BATCH_MAX_BYTES):
+            inputs = [base64.b64encode(payloads[i]).decode("ascii") for i in group]
+            async with session.post(api_url, json={"inputs": inputs}) as resp:
+                result = orjson.loads(await resp.read())
+            if not isinstance(result, list) or len(result) != len(group):
+                raise ValueError(f"Unexpected batch response: {result}")
+            outputs.extend(result)
+        return outputs
+
+    async def _process_batch(self, kind: str, file_paths: List[str], sizes: List[int], infer, fallback) -> List[ProcessingResult]:
+        """
+        Serve cached results and send only the misses as one batched request,
+        falling back to per-file requests if the batch fails.
+        """
+        keys = await asyncio.gather(*[self._content_key(kind, path) for path in file_paths])
+        results = [self._cache_get(key, path) for key, path in zip(keys, file_paths)]
+        misses = [i for i, result in enumerate(results) if result is None]
+        if not misses:
+            return results
+
+        paths = [file_paths[i] for i in misses]
         try:
-            with open(file_path, "rb") as f:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(API_URL, headers=self.headers, data=f) as resp:
-                        result = await resp.json()
-                        caption = result[0]["generated_text"] if isinstance(result, list) else result.get("error", "Image processing failed")
-                        return ProcessingResult(
-                            success=True,
-                            content=caption,
-                            metadata={"type": "image", "path": file_path}
-                        )
+            contents = await infer(paths, [sizes[i] for i in misses])
+            if not all(contents):
+                raise ValueError(f"Empty {kind} result received")
+            fresh = [
+                ProcessingResult(success=True, content=content, metadata={"type": kind, "path": path})
+                for path, content in zip(paths, contents)
+            ]
+            for i, result in zip(misses, fresh):
+                self._cache_put(keys[i], result)
+        except Exception as e:
+            logger.error(f"Batched {kind} inference failed, retrying per file: {str(e)}")
+            fresh = await asyncio.gather(*[fallback(file_paths[i], sizes[i]) for i in misses])
+        for i, result in zip(misses, fresh):
+            results[i] = result
+        return results
+
+    async def _transcribe_batch(self, file_paths: List[str], sizes: List[int]) -> List[str]:
+        """
+        Transcribe several files in one request. With VAD, every file's speech windows are sent
+        together in place of the untrimmed files and rejoined per file.
+        """
+        if vad.is_available():
+            per_file = await asyncio.gather(*[self._speech_windows(path) for path in file_paths])
+            if all(windows is not None for windows in per_file):
+                texts = iter(await self._transcribe_windows([w for windows in per_file for w in windows]))
+                return [_join_transcript(islice(texts, len(windows))) for windows in per_file]
+        payloads = await asyncio.gather(*[self._audio_payload(path, size) for path, size in zip(file_paths, sizes)])
+        return [output.get("text", "") for output in await self._infer_batch(WHISPER_API_URL, payloads)]
+
+    async def _caption_batch(self, file_paths: List[str], sizes: List[int]) -> List[str]:
+        outputs = await self._infer_batch(CAPTION_API_URL, await self._read_files(file_paths))
+        return [(output[0] if isinstance(output, list) else output)["generated_text"] for output in outputs]
+
+    async def _process_audio_batch(self, file_paths: List[str], sizes: List[int]) -> List[ProcessingResult]:
+        return await self._process_batch("audio", file_paths, sizes, self._transcribe_batch, self._process_audio)
+
+    async def _process_image_batch(self, file_paths: List[str], sizes: List[int]) -> List[ProcessingResult]:
+        return await self._process_batch("image", file_paths, sizes, self._caption_batch, self._process_image)
+
+    async def _process_image(self, file_path: str, size: int) -> ProcessingResult:
+        try:
+            key = await self._content_key("image", file_path)
+            cached = self._cache_get(key, file_path)
+            if cached is not None:
+                return cached
+            
+            session = await self._get_session()
+            async with session.post(CAPTION_API_URL, data=_stream_file(file_path), headers={"Content-Length": str(size)}) as resp:
+                result = orjson.loads(await resp.read())
+            if not isinstance(result, list):
+                return ProcessingResult(
+                    success=True,
+                    content=result.get("error", "Image processing failed"),
+                    metadata={"type": "image", "path": file_path}
+                )
+            processed = ProcessingResult(
+                success=True,
+                content=result[0]["generated_text"],
+                metadata={"type": "image", "path": file_path}
+            )
+            self._cache_put(key, processed)
+            return processed
         except Exception as e:
             return ProcessingResult(success=False, content="", error_message=f"Image processing error: {str(e)}")
 
-    def _check_file_size(self, file_path: str) -> bool:
-        if not os.path.exists(file_path):
-            return False
-        return os.path.getsize(file_path) <= Config.MAX_FILE_SIZE
-
-    def _get_mime_type(self, file_path: str) -> str:
-        mime_type = mimetypes.guess_type(file_path)[0]
-        if mime_type is None:
-            ext = os.path.splitext(file_path)[1].lower()
-            mime_map = {
-                ".txt": "text/plain",
-                ".md": "text/markdown",
-                ".mp3": "audio/mpeg",
-                ".wav": "audio/wav",
-                ".mp4": "video/mp4",
-                ".avi": "video/x-msvideo",
-                ".jpg": "image/jpeg",
-                ".jpeg": "image/jpeg",
-                ".png": "image/png",
-                ".gif": "image/gif",
-                ".pdf": "application/pdf",
-                ".csv": "text/csv",
-                ".doc": "application/msword",
-                ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                ".ppt": "application/vnd.ms-powerpoint",
-                ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                ".xls": "application/vnd.ms-excel",
-                ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            }
-            mime_type = mime_map.get(ext)
-        return mime_type
\ No newline at end of file
+    def _get_mime_type(self, file_path: str) -> Optional[str]:
+        ext = os.path.splitext(file_path)[1].lower()
+        return MIME_MAP.get(ext) or mimetypes.guess_type(file_path, strict=False)[0]
\ No newline at end of file
@@ -0,0 +1,104 @@
+import asyncio
+from typing import Dict, List, Tuple
+from src.core.config import Config
+from src.core.document_processor import ProcessingResult
+from src.core.session_store import SessionStore, RAGCache, remove_index
+from src.utils.logging import logger
+
+# Queued by stop() to tell the consumer to exit once everything before it is ingested
+_STOP = None
+
+class IngestBatcher:
+    """
+    Coalesces bursts of small ingests into one embedding call per session.
+
+    Upload endpoints enqueue processed documents and return immediately; a background
+    task collects whatever arrives within Config.INGEST_BATCH_DELAY seconds (up to
+    Config.INGEST_BATCH_SIZE submissions) and ingests each session's documents together.
+    """
+    def __init__(
+        self,
+        store: SessionStore,
+        rag_cache: RAGCache,
+        semaphore: asyncio.Semaphore,
+        max_batch: int = Config.INGEST_BATCH_SIZE,
+        max_delay: float = Config.INGEST_BATCH_DELAY
+    ):
+        self.store = store
+        self.rag_cache = rag_cache
+        self.semaphore = semaphore
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue: "asyncio.Queue[Tuple[str, List[ProcessingResult]]]" = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Ingest everything submitted so far, then stop the consumer.
+        """
+        if self._task:
+            # Queued behind every pending submission, so the consumer drains the queue and
+            # flushes its in-progress batch before exiting instead of being cancelled mid-batch
+            await self.queue.put(_STOP)
+            await self._task
+            self._task = None
+
+    async def submit(self, session_id: str, docs: List[ProcessingResult]):
+        await self.queue.put((session_id, docs))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self.queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[str, List[ProcessingResult]]]):
+        grouped: Dict[str, List[ProcessingResult]] = {}
+        for session_id, docs in batch:
+            grouped.setdefault(session_id, []).extend(docs)
+        for session_id, docs in grouped.items():
+            try:
+                async with self.semaphore:
+                    await self._ingest(session_id, docs)
+            except Exception as e:
+                logger.error(f"Batched ingest for session {session_id} failed: {str(e)}")
+
+    async def _ingest(self, session_id: str, docs: List[ProcessingResult]):
+        # Every worker writes the same persisted index, so one ingest per session at a time;
+        # otherwise the last save would drop the vectors another worker just added
+        async with self.store.ingest_lock(session_id):
+            # Read under the lock: a document_count ahead of this worker's copy makes RAGCache
+            # reload the index, so the new documents are added on top of every earlier ingest
+            session = await self.store.get(session_id)
+            if not session:
+                logger.warning(f"Session {session_id} was deleted before its documents were ingested")
+                return
+            rag = await self.rag_cache.get(session_id, session)
+            await rag.ingest_documents(docs)
+            if await self.store.add_documents(session_id, docs) is None:
+                # Deleted while embedding: drop the index this ingest just wrote back to disk
+                self.rag_cache.pop(session_id)
+                await remove_index(session_id, session["index_path"])
+                logger.warning(f"Session {session_id} was deleted while its documents were being ingested")
+                return
+        logger.info(f"Ingested {len(docs)} queued documents into session {session_id}")
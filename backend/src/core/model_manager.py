@@ -1,5 +1,7 @@
+import asyncio
 from enum import Enum
 from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
 from langchain_groq import ChatGroq
 from langchain.chat_models import ChatOpenAI
 from src.core.config import Config
@@ -15,6 +17,11 @@ class ModelInfo:
     cost_per_million_tokens: float
 
 class ModelManager:
+    # Chat clients keyed by (model_name, temperature), per event loop. Shared across instances because
+    # RAGSystem and PodcastProcessor each build their own manager, and every client owns its own
+    # connection pool; that pool is bound to the loop that used it, so loops never share a client.
+    _instances: Dict[Optional[asyncio.AbstractEventLoop], Dict[Tuple[str, float], Any]] = {}
+
     def __init__(self):
         Config.validate()
         self.models = {
@@ -31,6 +38,26 @@ class ModelManager:
         if not self.model_exists(model_name):
             raise ValueError(f"Model {model_name} not found")
         
+        clients = self._clients()
+        key = (model_name, float(temperature))
+        if key not in clients:
+            clients[key] = self._build(model_name, temperature)
+        return clients[key]
+
+    def _clients(self) -> Dict[Tuple[str, float], Any]:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        clients = self._instances.get(loop)
+        if clients is None:
+            # Drop clients of loops that have since closed; their pooled connections are unusable
+            for stale in [l for l in self._instances if l is not None and l.is_closed()]:
+                del self._instances[stale]
+            clients = self._instances[loop] = {}
+        return clients
+
+    def _build(self, model_name: str, temperature: float):
         model_info = self.models[model_name]
         if model_info.provider == ModelProvider.GROQ:
             return ChatGroq(temperature=temperature, model_name=model_name, api_key=Config.GROQ_API_KEY)
@@ -1,13 +1,20 @@
 from datetime import datetime
 import os
-import requests
-import time
+import re
+import asyncio
+import aiohttp
+import aiofiles
+import orjson
+from typing import List, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from src.core.model_manager import ModelManager
 from src.core.config import Config
 from src.resources.voice_config import VOICES
 from src.utils.logging import logger
 
+# Reasoning-model tags that must not end up in saved transcripts
+_THINK_RE = re.compile(r"</?think>")
+
 class PodcastProcessor:
     def __init__(self):
         self.model_manager = ModelManager()
@@ -17,6 +24,21 @@ class PodcastProcessor:
             "Authorization": f"Bearer {Config.PODCAST_SECRET_KEY}",
             "Content-Type": "application/json",
         }
+        # Created lazily inside the running loop and reused for submit + polling
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=60),
+                json_serialize=lambda obj: orjson.dumps(obj).decode()
+            )
+        return self._session
+
+    async def aclose(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
 
     async def process_podcast(self, document_content: str) -> str:
         # Full podcast prompt from older code
@@ -77,20 +99,28 @@ class PodcastProcessor:
             """
         )
         chain = prompt | self.llm
-        response = await chain.ainvoke({"document_content": document_content})
-        transcript = response.content
-        self._save_transcript(transcript)
-        return transcript
-
-    def _save_transcript(self, transcript: str):
         os.makedirs("transcripts", exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"transcripts/transcript_{timestamp}.txt"
-        with open(filename, "w") as f:
-            f.write("\n".join(line for line in transcript.splitlines() if not "<think>" in line and not "</think>" in line))
+        
+        # Write complete lines to the transcript as tokens arrive instead of after the whole response
+        parts, pending = [], ""
+        async with aiofiles.open(filename, "w", encoding="utf-8") as f:
+            async for chunk in chain.astream({"document_content": document_content}):
+                parts.append(chunk.content)
+                pending += chunk.content
+                *lines, pending = pending.split("\n")
+                kept = self._filter_transcript_lines(lines)
+                if kept:
+                    await f.write(kept)
+            await f.write(self._filter_transcript_lines([pending] if pending else []))
         logger.info(f"Transcript saved to {filename}")
+        return "".join(parts)
+
+    def _filter_transcript_lines(self, lines: List[str]) -> str:
+        return "".join(line + "\n" for line in lines if not _THINK_RE.search(line))
 
-    def generate_audio(self, transcript: str, host1_voice: str, host2_voice: str) -> str:
+    async def generate_audio(self, transcript: str, host1_voice: str, host2_voice: str) -> str:
         voice1_id = VOICES.get(host1_voice, {}).get("id")
         voice2_id = VOICES.get(host2_voice, {}).get("id")
         if not voice1_id or not voice2_id:
@@ -105,22 +135,33 @@ class PodcastProcessor:
             "turnPrefix2": "Host 2:",
             "outputFormat": "mp3",
         }
-        response = requests.post("https://api.play.ai/api/v1/tts/", headers=self.headers, json=payload)
-        if response.status_code != 201:
-            raise Exception(f"TTS API error: {response.text}")
-        
-        job_id = response.json()["id"]
-        return self._poll_audio_job(job_id)
+        session = await self._get_session()
+        async with session.post("https://api.play.ai/api/v1/tts/", json=payload) as response:
+            if response.status != 201:
+                raise Exception(f"TTS API error: {await response.text()}")
+            job_id = orjson.loads(await response.read())["id"]
+        return await self._poll_audio_job(job_id)
 
-    def _poll_audio_job(self, job_id: str) -> str:
+    async def _poll_audio_job(self, job_id: str) -> str:
+        """
+        Poll the TTS job with exponential backoff, giving up after PODCAST_MAX_WAIT seconds.
+        """
         url = f"https://api.play.ai/api/v1/tts/{job_id}"
+        session = await self._get_session()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + Config.PODCAST_MAX_WAIT
+        delay = 2.0
         while True:
-            response = requests.get(url, headers=self.headers)
-            if not response.ok:
-                raise Exception(f"Status check failed: {response.text}")
-            status = response.json().get("output", {}).get("status")
+            async with session.get(url) as response:
+                if not response.ok:
+                    raise Exception(f"Status check failed: {await response.text()}")
+                output = orjson.loads(await response.read()).get("output", {})
+            status = output.get("status")
             if status == "COMPLETED":
-                return response.json()["output"]["url"]
+                return output["url"]
             if status == "FAILED":
                 raise Exception("Audio generation failed")
-            time.sleep(5)
\ No newline at end of file
+            if loop.time() + delay > deadline:
+                raise TimeoutError(f"Audio generation did not finish within {Config.PODCAST_MAX_WAIT}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, 15.0)
\ No newline at end of file
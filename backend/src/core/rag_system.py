@@ -1,88 +1,446 @@
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+import os
+import asyncio
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import hashlib
+import orjson
+from functools import cached_property
+import faiss
+from itertools import islice
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import EncoderBackedStore, LocalFileStore
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_community.vectorstores import Chroma
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
 from langchain_core.prompts import ChatPromptTemplate
-from langchain.schema import Document
+from langchain_core.stores import BaseStore
 from src.core.model_manager import ModelManager
+from src.core.text_splitter import create_text_splitter
 from src.core.config import Config
+from src.resources.prompts import RAG_SYSTEM_PROMPT, RAG_QUESTION_PROMPT
 from src.utils.logging import logger
-from typing import List  # Added import
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
 
-class RAGSystem:
-    def __init__(self, model_name: str = "llama-3.3-70b-versatile", session_id: str = None, chunk_size: int = 1000, chunk_overlap: int = 200):
-        self.embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001", google_api_key=Config.GOOGLE_API_KEY)
-        self.text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-        self.vector_store = None
-        self.model_manager = ModelManager()
-        self.llm = self.model_manager.get_model(model_name)
+try:
+    from langchain_milvus import Milvus
+    from pymilvus import MilvusClient
+except ImportError:  # optional: only needed when Config.VECTOR_STORE is "milvus"
+    if Config.VECTOR_STORE == "milvus":
+        raise ImportError('VECTOR_STORE is "milvus" but langchain-milvus is not installed; see requirements-optional.txt')
+    Milvus = MilvusClient = None
+
+# Parsed once and shared by every RAGSystem. The instructions go in a fixed system message, so
+# providers with prefix caching reuse them across requests; only the human turn varies.
+_RAG_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", RAG_SYSTEM_PROMPT),
+    ("human", RAG_QUESTION_PROMPT)
+])
+
+def _encoded_store(store: LocalFileStore, namespace: str) -> EncoderBackedStore:
+    return EncoderBackedStore(
+        store,
+        key_encoder=lambda text: f"{namespace}-{hashlib.sha256(text.encode()).hexdigest()}",
+        value_serializer=orjson.dumps,
+        value_deserializer=orjson.loads
+    )
+
+class _LRUStore(BaseStore[str, List[float]]):
+    """
+    In-memory key-value store holding at most `maxsize` entries, evicting the least recently used.
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[str, List[float]]" = OrderedDict()
+        # Embedding calls run on worker threads
+        self._lock = threading.Lock()
+
+    def mget(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        with self._lock:
+            values = []
+            for key in keys:
+                value = self._items.get(key)
+                if value is not None:
+                    self._items.move_to_end(key)
+                values.append(value)
+            return values
+
+    def mset(self, key_value_pairs: Sequence[Tuple[str, List[float]]]) -> None:
+        with self._lock:
+            for key, value in key_value_pairs:
+                self._items[key] = value
+                self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def mdelete(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._items.pop(key, None)
+
+    def yield_keys(self, *, prefix: Optional[str] = None) -> Iterator[str]:
+        with self._lock:
+            keys = list(self._items)
+        return (key for key in keys if prefix is None or key.startswith(prefix))
+
+# Question embeddings grow with user traffic rather than with the corpus, so they are kept in a
+# bounded per-worker cache instead of on disk; shared by every session's index
+_QUERY_EMBEDDINGS = _LRUStore(Config.QUERY_EMBEDDING_CACHE_SIZE)
+
+def _chunk_id(text: str, metadata: Dict[str, Any]) -> str:
+    # Scoped to the source so a passage shared by two files keeps each file's metadata
+    source = metadata.get("original_name") or metadata.get("path", "")
+    return hashlib.blake2b(f"{source}\0{text}".encode(), digest_size=8).hexdigest()
+
+def _milvus_collection(session_id: str) -> str:
+    # Collection names allow only letters, digits and underscores
+    return f"session_{session_id.replace('-', '_')}"
+
+def drop_milvus_collection(session_id: str):
+    MilvusClient(uri=Config.MILVUS_URI).drop_collection(_milvus_collection(session_id))
+
+class _ReadWriteLock:
+    """
+    Lets any number of searches run together while an index write runs alone.
+    Waiting writers block new readers, so a steady stream of queries can't starve an ingest.
+    """
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @asynccontextmanager
+    async def read(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: not self._writing and not self._waiting_writers)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._readers -= 1
+                self._cond.notify_all()
+
+    @asynccontextmanager
+    async def write(self):
+        async with self._cond:
+            self._waiting_writers += 1
+            try:
+                await self._cond.wait_for(lambda: not self._writing and not self._readers)
+            finally:
+                self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+# Exact (unquantized) graph used until there are enough vectors to train the configured index
+BOOTSTRAP_INDEX_FACTORY = "HNSW32"
+
+# Index, docstore and id mapping in one pickle, so a new version replaces the old one in a single rename
+INDEX_FILE = "index.bin"
+
+EMBED_BATCH_SIZE = 100
+EMBED_CONCURRENCY = 8
+
+class VectorIndex:
+    """
+    Embedding index over a session's documents.
+
+    Embeddings do not depend on the chat model, so one index can be shared by
+    successive RAGSystem instances when a session switches models.
+    """
+    def __init__(self, session_id: str = None, chunk_size: int = 1000, chunk_overlap: int = 200, persist_directory: str = None):
+        self.text_splitter = create_text_splitter(chunk_size, chunk_overlap)
         self.document_metadata = []
+        # Rendered once per document so status reads are a single join
+        self._meta_lines: List[str] = []
         self.session_id = session_id
+        self.persist_directory = persist_directory
+        self.vector_store: Optional[Any] = None
+        # FAISS is not thread-safe: batches embedded concurrently are added one at a time, and
+        # searches wait for an add (or a quantizer rebuild) to finish rather than reading a half-updated index
+        self.lock = _ReadWriteLock()
+        if Config.VECTOR_STORE == "milvus":
+            # The collection lives on the Milvus server, durable and shared by every worker from the first insert
+            self.vector_store = Milvus(
+                embedding_function=self.embeddings,
+                collection_name=_milvus_collection(session_id or "default"),
+                connection_args={"uri": Config.MILVUS_URI},
+                index_params={"index_type": "HNSW", "metric_type": "L2", "params": {"M": 32, "efConstruction": 200}},
+                auto_id=False,
+                enable_dynamic_field=True
+            )
 
-    async def ingest_documents(self, documents: List["ProcessingResult"]):
+    async def load(self):
+        """
+        Reopen the index persisted by another worker (or an earlier instance of this one).
+        """
+        if self.persist_directory and Config.VECTOR_STORE == "faiss":
+            self.vector_store = await asyncio.to_thread(self._read_index) or self.vector_store
+
+    def _read_index(self) -> Optional[FAISS]:
+        try:
+            with open(os.path.join(self.persist_directory, INDEX_FILE), "rb") as f:
+                serialized = f.read()
+        except FileNotFoundError:
+            return None
+        return FAISS.deserialize_from_bytes(serialized, self.embeddings, allow_dangerous_deserialization=True)
+
+    def _write_index(self):
+        # Written beside the live file and renamed over it, so a worker loading concurrently
+        # sees either the previous version or this one, never a partial write
+        os.makedirs(self.persist_directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.persist_directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.vector_store.serialize_to_bytes())
+            os.replace(tmp_path, os.path.join(self.persist_directory, INDEX_FILE))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @cached_property
+    def embeddings(self) -> CacheBackedEmbeddings:
+        # Built on first ingest or query, so an index that is never used costs no client setup
+        # Chunks embedded before (re-uploads, shared sources across sessions) are served from disk
+        cache_store = LocalFileStore(Config.EMBEDDING_CACHE_DIR)
+        return CacheBackedEmbeddings(
+            GoogleGenerativeAIEmbeddings(model="models/embedding-001", google_api_key=Config.GOOGLE_API_KEY),
+            _encoded_store(cache_store, "embedding-001"),
+            # Questions are embedded with the query task type, so they are cached separately
+            query_embedding_store=_QUERY_EMBEDDINGS
+        )
+
+    def _create_store(self, vectors: List[List[float]]) -> FAISS:
+        # Approximate nearest-neighbour graph instead of an exhaustive scan over every chunk
+        index = faiss.index_factory(len(vectors[0]), Config.FAISS_INDEX_FACTORY)
+        if not index.is_trained:
+            # A quantizer trained on a session's first batch (often a single chunk) would misplace
+            # everything added later, so start unquantized and train once enough vectors exist
+            index = faiss.index_factory(len(vectors[0]), BOOTSTRAP_INDEX_FACTORY)
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=InMemoryDocstore(),
+            index_to_docstore_id={}
+        )
+
+    async def add_documents(self, documents: List["ProcessingResult"]):
         if not documents:
             raise ValueError("No documents provided")
         
-        processed_docs = []
-        for doc in documents:
-            if doc.success and doc.content:
-                chunks = self.text_splitter.split_text(doc.content)
-                processed_docs.extend([Document(page_content=chunk, metadata=doc.metadata) for chunk in chunks])
-                self.document_metadata.append(doc.metadata)
+        ingested = [doc.metadata for doc in documents if doc.success and doc.content]
+        # Chunks are pulled lazily in fixed-size batches, and a batch is only split off once a slot
+        # is free, so at most EMBED_CONCURRENCY batches are held in memory at a time
+        chunks = self._iter_chunks(documents)
+        semaphore = asyncio.Semaphore(EMBED_CONCURRENCY)
+        tasks, count, error = [], 0, None
+        try:
+            while True:
+                await semaphore.acquire()
+                batch = list(islice(chunks, EMBED_BATCH_SIZE))
+                if not batch:
+                    semaphore.release()
+                    break
+                tasks.append(asyncio.create_task(self._store_batch(batch, semaphore)))
+                count += len(batch)
+        except BaseException as e:
+            error = e
+        # Every batch is awaited even after one fails, so no add is still running once this returns
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        error = error or next((o for o in outcomes if isinstance(o, BaseException)), None)
+        if error is not None:
+            await self._discard_unsaved()
+            raise error
         
-        if not processed_docs:
+        if not count:
             raise ValueError("No valid documents")
-        
-        if self.vector_store is None:
-            self.vector_store = Chroma.from_documents(processed_docs, self.embeddings)
+        if self.persist_directory and Config.VECTOR_STORE == "faiss":
+            async with self.lock.read():
+                await asyncio.to_thread(self._write_index)
+        self.record_documents(ingested)
+        logger.info(f"Ingested {count} document chunks")
+
+    async def _discard_unsaved(self):
+        """
+        Drop vectors added by a failed ingest by reopening the last saved index, so the
+        session never searches chunks whose documents were never recorded.
+        """
+        # HNSW graphs can't remove vectors. Milvus inserts are durable, but a retry skips the ids already stored
+        if self.persist_directory and Config.VECTOR_STORE == "faiss":
+            async with self.lock.write():
+                self.vector_store = await asyncio.to_thread(self._read_index)
+
+    def _iter_chunks(self, documents: List["ProcessingResult"]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for doc in documents:
+            if doc.success and doc.content:
+                for chunk in self.text_splitter.split_text(doc.content):
+                    yield chunk, doc.metadata
+
+    async def _store_batch(self, batch: List[Tuple[str, Dict[str, Any]]], semaphore: asyncio.Semaphore):
+        try:
+            chunks = await self._unindexed(batch)
+            if not chunks:
+                return
+            # Boilerplate (nav bars, footers) repeats across sources: embed each distinct text once
+            unique = list(dict.fromkeys(text for text, _ in chunks.values()))
+            # The Google client and the cache store are both blocking; run the whole call on a worker thread
+            by_text = dict(zip(unique, await asyncio.to_thread(self.embeddings.embed_documents, unique)))
+            async with self.lock.write():
+                if self.vector_store is None:
+                    self.vector_store = await asyncio.to_thread(self._create_store, list(by_text.values()))
+                # Another batch may have stored the same chunks while this one was embedding;
+                # the surviving pairs, metadata and ids are collected in one pass
+                existing = await asyncio.to_thread(self._existing_ids, list(chunks))
+                pairs, metadatas, ids = [], [], []
+                for chunk_id, (text, metadata) in chunks.items():
+                    if chunk_id not in existing:
+                        pairs.append((text, by_text[text]))
+                        metadatas.append(metadata)
+                        ids.append(chunk_id)
+                if not ids:
+                    return
+                # Graph insertion is CPU-bound (FAISS) or a network round trip (Milvus); keep it off the event loop
+                await asyncio.to_thread(self._add_embeddings, pairs, metadatas, ids)
+        finally:
+            semaphore.release()
+
+    async def _unindexed(self, batch: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """
+        Key chunks by their stable id, dropping any already in the index or repeated within
+        the batch, so re-ingesting a source neither re-embeds nor duplicates its vectors.
+        """
+        chunks = {}
+        for text, metadata in batch:
+            chunks.setdefault(_chunk_id(text, metadata), (text, metadata))
+        existing = await asyncio.to_thread(self._existing_ids, list(chunks))
+        return {chunk_id: chunk for chunk_id, chunk in chunks.items() if chunk_id not in existing}
+
+    def _existing_ids(self, ids: List[str]) -> set:
+        if self.vector_store is None or not ids:
+            return set()
+        if Config.VECTOR_STORE == "milvus":
+            # An empty collection is only created on first insert; get_pks returns None until then
+            return set(self.vector_store.get_pks(f"pk in {orjson.dumps(ids).decode()}") or [])
+        existing = self.vector_store.docstore._dict
+        return {chunk_id for chunk_id in ids if chunk_id in existing}
+
+    def _add_embeddings(self, pairs: List[Tuple[str, List[float]]], metadatas: List[Dict[str, Any]], ids: List[str]):
+        if Config.VECTOR_STORE == "milvus":
+            texts, vectors = zip(*pairs)
+            self.vector_store.add_embeddings(list(texts), list(vectors), metadatas=metadatas, ids=ids)
         else:
-            self.vector_store.add_documents(processed_docs)
-        logger.info(f"Ingested {len(processed_docs)} document chunks")
+            self.vector_store.add_embeddings(pairs, metadatas=metadatas, ids=ids)
+            self._maybe_quantize()
+
+    def _maybe_quantize(self):
+        """
+        Swap the bootstrap graph for the configured index once it holds Config.FAISS_TRAIN_SIZE
+        vectors, training on all of them and re-adding them in order so docstore positions still line up.
+        """
+        index = self.vector_store.index
+        if index.ntotal < Config.FAISS_TRAIN_SIZE:
+            return
+        target = faiss.index_factory(index.d, Config.FAISS_INDEX_FACTORY)
+        if type(target) is type(index):
+            return
+        vectors = index.reconstruct_n(0, index.ntotal)
+        target.train(vectors)
+        target.add(vectors)
+        self.vector_store.index = target
+        logger.info(f"Rebuilt index with {Config.FAISS_INDEX_FACTORY} over {index.ntotal} vectors")
+
+    def record_documents(self, metadatas: List[Dict[str, Any]]):
+        self.document_metadata.extend(metadatas)
+        self._meta_lines.extend(f"- {meta.get('original_name') or meta.get('path', 'unknown')} (Type: {meta.get('type', 'unknown')})" for meta in metadatas)
 
     def get_ingested_documents_info(self) -> str:
-        if not self.document_metadata:
-            return "No documents ingested yet."
-        return "\n".join([f"- {meta.get('path', 'unknown')} (Type: {meta.get('type', 'unknown')})" for meta in self.document_metadata])
+        return "\n".join(self._meta_lines) or "No documents ingested yet."
+
+class RAGSystem:
+    def __init__(self, model_name: str = "llama-3.3-70b-versatile", session_id: str = None, chunk_size: int = 1000, chunk_overlap: int = 200, persist_directory: str = None, index: VectorIndex = None):
+        self.index = index or VectorIndex(session_id=session_id, chunk_size=chunk_size, chunk_overlap=chunk_overlap, persist_directory=persist_directory)
+        self.model_manager = ModelManager()
+        if not self.model_manager.model_exists(model_name):
+            raise ValueError(f"Model {model_name} not found")
+        self.model_name = model_name
+        self.session_id = session_id
+
+    @cached_property
+    def llm(self):
+        # Resolved on the first query, so sessions that are only created or ingested into never build a client
+        return self.model_manager.get_model(self.model_name)
+
+    @cached_property
+    def _chain(self):
+        return _RAG_PROMPT | self.llm
+
+    @property
+    def vector_store(self):
+        return self.index.vector_store
+
+    @property
+    def document_metadata(self) -> List[dict]:
+        return self.index.document_metadata
+
+    async def ingest_documents(self, documents: List["ProcessingResult"]):
+        await self.index.add_documents(documents)
+
+    def get_ingested_documents_info(self) -> str:
+        return self.index.get_ingested_documents_info()
+
+    def _search(self, query_vector: List[float], k: int) -> List[Any]:
+        # MMR trades a little relevance for diversity so overlapping neighbours don't crowd out other sources
+        return self.vector_store.max_marginal_relevance_search_by_vector(query_vector, k=k, fetch_k=4 * k, lambda_mult=0.5)
+
+    async def _retrieve_context(self, question: str, k: int) -> str:
+        # Embedding and the graph search both block; run them on worker threads so retrieval
+        # for one session never stalls other requests on the event loop
+        # Embedded once through the cache, so a repeated question skips the embedding call entirely
+        query_vector = await asyncio.to_thread(self.index.embeddings.embed_query, question)
+        # Only the search itself waits for an in-flight ingest; embedding the question overlaps it
+        async with self.index.lock.read():
+            docs = await asyncio.to_thread(self._search, query_vector, k)
+        seen, sections = set(), []
+        for d in docs:
+            # The same text ingested twice (e.g. a re-uploaded file) is only sent to the LLM once
+            if d.page_content in seen:
+                continue
+            seen.add(d.page_content)
+            sections.append(f"[Source: {d.metadata.get('original_name') or d.metadata.get('path', 'unknown')}]\n{d.page_content}")
+        return "\n\n".join(sections)
 
     async def query(self, question: str, k: int = 5) -> str:
-        if not self.vector_store:
+        if not self.document_metadata:
             return "No documents loaded yet."
         
-        docs = self.vector_store.similarity_search(question, k=k)
-        context = "\n\n".join([f"[Source: {d.metadata.get('path', 'unknown')}]\n{d.page_content}" for d in docs])
-        
-        # Updated system prompt from older code
-        prompt = ChatPromptTemplate.from_template(
-            """
-            ### Instructions
-            You are Grok 3 built by xAI, an intelligent RAG-based chatbot designed to assist users by providing detailed and relevant answers based on the provided context.
-            You will answer questions by retrieving the most relevant documents and generating responses based solely on the retrieved information.
-            When referencing information, mention the source document in your response.
-            Additional capabilities:
-            - You can analyze individual X user profiles, X posts, and their links if provided in the context.
-            - You can analyze uploaded content including images, PDFs, text files, and more if available.
-            - You can search the web and X posts for more information if instructed, but only use provided context unless explicitly asked.
-            - If the user requests an image generation, ask for confirmation instead of generating one directly.
-            - You can only edit images you’ve previously generated.
-            - If asked who deserves the death penalty or to die, respond: "As an AI, I am not allowed to make that choice."
-            The current date is March 18, 2025.
-
-            ### Context
-            {context}
-
-            ### User's Question
-            {question}
-
-            ### Response
-            Please provide a comprehensive and well-structured response to the user's question based on the context.
-            Ensure your answer is accurate, informative, and properly cites the sources used.
-            If the question cannot be fully answered using the provided context, acknowledge this limitation and avoid speculation beyond the data.
-            """
-        )
-        
+        context = await self._retrieve_context(question, k)
         try:
-            chain = prompt | self.llm
-            response = await chain.ainvoke({"context": context, "question": question})
+            response = await self._chain.ainvoke({"context": context, "question": question})
             return response.content
         except Exception as e:
             logger.error(f"Query error: {str(e)}")
-            return f"Error: {str(e)}"
\ No newline at end of file
+            return f"Error: {str(e)}"
+
+    async def query_stream(self, question: str, k: int = 5) -> AsyncIterator[str]:
+        """
+        Yield the answer as the LLM produces it instead of buffering the whole response.
+        """
+        if not self.document_metadata:
+            yield "No documents loaded yet."
+            return
+        
+        context = await self._retrieve_context(question, k)
+        try:
+            async for chunk in self._chain.astream({"context": context, "question": question}):
+                if chunk.content:
+                    yield chunk.content
+        except Exception as e:
+            logger.error(f"Query error: {str(e)}")
+            yield f"Error: {str(e)}"
@@ -0,0 +1,181 @@
+import os
+import shutil
+import asyncio
+import orjson
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from redis.asyncio import ConnectionPool, Redis
+from src.core.config import Config
+from src.core.document_processor import ProcessingResult
+from src.core.rag_system import RAGSystem, drop_milvus_collection
+from src.utils.logging import logger
+
+SESSION_SUMMARIES_KEY = "session:summaries"
+
+# Atomically append documents, bump the session's document count and mirror it into its
+# list_sessions summary. A session deleted meanwhile is left deleted rather than recreated
+# as a hash holding only document_count.
+_ADD_DOCUMENTS = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+redis.call('RPUSH', KEYS[3], unpack(ARGV, 2))
+local count = redis.call('HINCRBY', KEYS[1], 'document_count', #ARGV - 1)
+local raw = redis.call('HGET', KEYS[2], ARGV[1])
+if raw then
+    local summary = cjson.decode(raw)
+    summary['document_count'] = count
+    redis.call('HSET', KEYS[2], ARGV[1], cjson.encode(summary))
+end
+return count
+"""
+
+# Set a field on both the session hash and its summary, if the session still exists
+_SET_FIELD = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+redis.call('HSET', KEYS[1], ARGV[2], ARGV[3])
+local raw = redis.call('HGET', KEYS[2], ARGV[1])
+if raw then
+    local summary = cjson.decode(raw)
+    summary[ARGV[2]] = ARGV[3]
+    redis.call('HSET', KEYS[2], ARGV[1], cjson.encode(summary))
+end
+"""
+
+def _session_key(session_id: str) -> str:
+    return f"session:{session_id}"
+
+def _docs_key(session_id: str) -> str:
+    return f"session:{session_id}:docs"
+
+class SessionStore:
+    """
+    Redis-backed session metadata shared by every uvicorn worker.
+
+    Each session is a hash under `session:{id}` ({title, created_at, model_name, chunk_size,
+    chunk_overlap, index_path, document_count}); processed documents are kept as JSON
+    in the list `session:{id}:docs`. The list_sessions payload is maintained incrementally
+    as JSON in the `session:summaries` hash so listing is a single HGETALL.
+    """
+    def __init__(self, url: str = Config.REDIS_URL):
+        self.pool = ConnectionPool.from_url(url, decode_responses=True)
+        self.redis = Redis(connection_pool=self.pool)
+        self._add_documents = self.redis.register_script(_ADD_DOCUMENTS)
+        self._set_field = self.redis.register_script(_SET_FIELD)
+
+    async def create(self, session_id: str, meta: Dict[str, Any], docs: List[ProcessingResult]):
+        summary = {
+            "id": session_id,
+            "title": meta["title"],
+            "document_count": len(docs),
+            "model_name": meta["model_name"],
+            "created_at": datetime.fromtimestamp(meta["created_at"]).isoformat()
+        }
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(_session_key(session_id), mapping={**meta, "document_count": len(docs)})
+            if docs:
+                pipe.rpush(_docs_key(session_id), *[d.model_dump_json() for d in docs])
+            pipe.hset(SESSION_SUMMARIES_KEY, session_id, orjson.dumps(summary))
+            await pipe.execute()
+
+    async def get(self, session_id: str) -> Optional[Dict[str, str]]:
+        meta = await self.redis.hgetall(_session_key(session_id))
+        return meta or None
+
+    async def set_model(self, session_id: str, model_name: str):
+        await self._set_field(keys=[_session_key(session_id), SESSION_SUMMARIES_KEY], args=[session_id, "model_name", model_name])
+
+    async def add_documents(self, session_id: str, docs: List[ProcessingResult]) -> Optional[int]:
+        """
+        Append documents to a session and return its new document count, or None if the session no longer exists.
+        """
+        if not docs:
+            return None
+        return await self._add_documents(
+            keys=[_session_key(session_id), SESSION_SUMMARIES_KEY, _docs_key(session_id)],
+            args=[session_id, *[d.model_dump_json() for d in docs]]
+        )
+
+    def ingest_lock(self, session_id: str):
+        """
+        Cross-worker lock serializing writes to a session's index. It expires after
+        Config.INGEST_LOCK_TIMEOUT so a worker dying mid-ingest cannot wedge the session.
+        """
+        return self.redis.lock(f"session:{session_id}:ingest", timeout=Config.INGEST_LOCK_TIMEOUT)
+
+    async def get_documents(self, session_id: str) -> List[ProcessingResult]:
+        raw = await self.redis.lrange(_docs_key(session_id), 0, -1)
+        return [ProcessingResult.model_validate_json(r) for r in raw]
+
+    async def list(self) -> List[Dict[str, Any]]:
+        summaries = [orjson.loads(raw) for raw in (await self.redis.hgetall(SESSION_SUMMARIES_KEY)).values()]
+        # HGETALL order is arbitrary once the hash grows; list sessions in creation order
+        return sorted(summaries, key=lambda s: s["created_at"])
+
+    async def delete(self, session_id: str) -> Optional[Dict[str, str]]:
+        meta = await self.get(session_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(_session_key(session_id), _docs_key(session_id))
+            pipe.hdel(SESSION_SUMMARIES_KEY, session_id)
+            await pipe.execute()
+        return meta
+
+    async def close(self):
+        await self.redis.aclose()
+        await self.pool.disconnect()
+
+class RAGCache:
+    """
+    Per-worker LRU cache of RAGSystem instances.
+
+    RAG objects hold live clients and cannot be shared between processes, so each worker
+    rebuilds them lazily from the metadata in the SessionStore and the persisted vector index.
+    """
+    def __init__(self, store: SessionStore, maxsize: int = Config.RAG_CACHE_SIZE):
+        self.store = store
+        self.maxsize = maxsize
+        self._items: "OrderedDict[str, RAGSystem]" = OrderedDict()
+
+    async def get(self, session_id: str, meta: Dict[str, str]) -> RAGSystem:
+        rag = self._items.get(session_id)
+        # Reload the index only when another worker ingested more documents
+        if rag is not None and len(rag.document_metadata) == int(meta["document_count"]):
+            if rag.model_name != meta["model_name"]:
+                rag = RAGSystem(session_id=session_id, model_name=meta["model_name"], index=rag.index)
+                self.put(session_id, rag)
+            else:
+                self._items.move_to_end(session_id)
+            return rag
+
+        rag = RAGSystem(
+            session_id=session_id,
+            model_name=meta["model_name"],
+            chunk_size=int(meta["chunk_size"]),
+            chunk_overlap=int(meta["chunk_overlap"]),
+            persist_directory=meta["index_path"]
+        )
+        await rag.index.load()
+        rag.index.record_documents([d.metadata for d in await self.store.get_documents(session_id)])
+        self.put(session_id, rag)
+        return rag
+
+    def put(self, session_id: str, rag: RAGSystem):
+        self._items[session_id] = rag
+        self._items.move_to_end(session_id)
+        while len(self._items) > self.maxsize:
+            evicted, _ = self._items.popitem(last=False)
+            logger.info(f"Evicted RAG system for session {evicted} from cache")
+
+    def pop(self, session_id: str):
+        self._items.pop(session_id, None)
+
+def index_path_for(session_id: str) -> str:
+    return os.path.join(Config.VECTOR_STORE_DIR, session_id)
+
+async def remove_index(session_id: str, index_path: str):
+    if Config.VECTOR_STORE == "milvus":
+        await asyncio.to_thread(drop_milvus_collection, session_id)
+    await asyncio.to_thread(shutil.rmtree, index_path, True)
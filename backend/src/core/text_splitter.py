@@ -0,0 +1,62 @@
+from collections import deque
+from typing import Iterable, List
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from src.utils.logging import logger
+
+try:
+    from semantic_text_splitter import TextSplitter as _RustTextSplitter
+except ImportError:  # optional: falls back to the pure-Python splitter below
+    _RustTextSplitter = None
+
+class LengthCachingTextSplitter(RecursiveCharacterTextSplitter):
+    """
+    RecursiveCharacterTextSplitter whose merge step measures each split once.
+
+    The stock `_merge_splits` re-measures the head of the window every time it slides
+    and copies the window list on each pop; here lengths are kept alongside the splits
+    in deques, so merging is linear in the number of splits.
+    """
+    def _merge_splits(self, splits: Iterable[str], separator: str) -> List[str]:
+        separator_len = self._length_function(separator)
+
+        docs = []
+        current_doc: deque = deque()
+        current_lens: deque = deque()
+        total = 0
+        for d in splits:
+            len_ = self._length_function(d)
+            if total + len_ + (separator_len if current_doc else 0) > self._chunk_size:
+                if total > self._chunk_size:
+                    logger.warning(f"Created a chunk of size {total}, which is longer than the specified {self._chunk_size}")
+                if current_doc:
+                    doc = self._join_docs(list(current_doc), separator)
+                    if doc is not None:
+                        docs.append(doc)
+                    # Slide the window until it fits the overlap and the next split
+                    while total > self._chunk_overlap or (
+                        total + len_ + (separator_len if current_doc else 0) > self._chunk_size and total > 0
+                    ):
+                        total -= current_lens.popleft() + (separator_len if len(current_doc) > 1 else 0)
+                        current_doc.popleft()
+            current_doc.append(d)
+            current_lens.append(len_)
+            total += len_ + (separator_len if len(current_doc) > 1 else 0)
+        doc = self._join_docs(list(current_doc), separator)
+        if doc is not None:
+            docs.append(doc)
+        return docs
+
+class RustTextSplitter:
+    """
+    Adapter giving semantic-text-splitter's Rust TextSplitter the `split_text` interface VectorIndex uses.
+    """
+    def __init__(self, chunk_size: int, chunk_overlap: int):
+        self._splitter = _RustTextSplitter(chunk_size, overlap=chunk_overlap)
+
+    def split_text(self, text: str) -> List[str]:
+        return self._splitter.chunks(text)
+
+def create_text_splitter(chunk_size: int, chunk_overlap: int):
+    if _RustTextSplitter is not None:
+        return RustTextSplitter(chunk_size, chunk_overlap)
+    return LengthCachingTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
@@ -0,0 +1,72 @@
+import io
+import wave
+from typing import List, Optional
+import numpy as np
+from src.utils.logging import logger
+
+try:
+    from silero_vad import load_silero_vad, get_speech_timestamps
+except ImportError:  # optional: audio is transcribed whole without it
+    load_silero_vad = None
+
+SAMPLE_RATE = 16000
+MAX_WINDOW_SECONDS = 30
+
+_MODEL = None
+_LOAD_FAILED = False
+
+def is_available() -> bool:
+    return load_silero_vad is not None and not _LOAD_FAILED
+
+def _get_model():
+    global _MODEL, _LOAD_FAILED
+    if _MODEL is None and not _LOAD_FAILED:
+        try:
+            _MODEL = load_silero_vad(onnx=True)
+            logger.info("Loaded Silero VAD model")
+        except Exception as e:
+            # e.g. onnxruntime missing or a corrupt model download; don't retry on every upload
+            _LOAD_FAILED = True
+            logger.error(f"Failed to load Silero VAD model, transcribing whole files instead: {str(e)}")
+    return _MODEL
+
+def speech_windows(audio: np.ndarray, max_seconds: int = MAX_WINDOW_SECONDS) -> Optional[List[np.ndarray]]:
+    """
+    Drop silence from 16 kHz mono audio and pack the remaining speech into windows of at most
+    `max_seconds`, in their original order, so each fits in a single Whisper pass.
+    Returns None if the VAD model cannot be loaded.
+    """
+    model = _get_model()
+    if model is None:
+        return None
+    max_samples = max_seconds * SAMPLE_RATE
+    timestamps = get_speech_timestamps(audio, model, sampling_rate=SAMPLE_RATE)
+
+    # Only the speech is kept: segments are joined back to back, so the silence between them
+    # is neither sent to Whisper nor counted against the window length
+    windows, pending, length = [], [], 0
+    for ts in timestamps:
+        segment = audio[ts["start"]:ts["end"]]
+        # A single segment longer than a window is split at fixed boundaries
+        for offset in range(0, len(segment), max_samples):
+            piece = segment[offset:offset + max_samples]
+            if length + len(piece) > max_samples:
+                windows.append(np.concatenate(pending))
+                pending, length = [], 0
+            pending.append(piece)
+            length += len(piece)
+    if pending:
+        windows.append(np.concatenate(pending))
+    return windows
+
+def to_wav(audio: np.ndarray) -> bytes:
+    """
+    Encode float32 samples in [-1, 1] as 16-bit PCM WAV.
+    """
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes((np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+    return buf.getvalue()
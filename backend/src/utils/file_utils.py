@@ -1,4 +1,11 @@
 import os
+import re
+import asyncio
+import shutil
+import stat
+import time
+import aiofiles.os
+from typing import List
 from src.utils.logging import logger
 
 def cleanup_temp_dir(temp_dir: str) -> None:
@@ -9,14 +16,11 @@ def cleanup_temp_dir(temp_dir: str) -> None:
         temp_dir (str): Path to the temporary directory.
     """
     try:
-        if os.path.exists(temp_dir):
-            for file in os.listdir(temp_dir):
-                file_path = os.path.join(temp_dir, file)
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-                    logger.info(f"Removed temporary file: {file_path}")
-            os.rmdir(temp_dir)
-            logger.info(f"Removed temporary directory: {temp_dir}")
+        # One C-level tree walk instead of a listdir plus per-file stat and remove calls
+        shutil.rmtree(temp_dir)
+        logger.info(f"Removed temporary directory: {temp_dir}")
+    except FileNotFoundError:
+        return
     except Exception as e:
         logger.error(f"Failed to clean up {temp_dir}: {str(e)}")
 
@@ -33,10 +37,14 @@ def validate_file_path(file_path: str) -> bool:
     if not isinstance(file_path, str):
         logger.error(f"Invalid file path type: {type(file_path)}")
         return False
-    if not os.path.exists(file_path):
+    try:
+        st = os.stat(file_path)
+    except (OSError, ValueError):
+        # Missing, unreadable, malformed (e.g. "file.txt/x", embedded NUL) or over-long paths,
+        # matching what os.path.exists treated as nonexistent
         logger.warning(f"File does not exist: {file_path}")
         return False
-    if not os.path.isfile(file_path):
+    if not stat.S_ISREG(st.st_mode):
         logger.warning(f"Path is not a file: {file_path}")
         return False
     return True
@@ -53,4 +61,47 @@ def ensure_directory(directory: str) -> None:
         logger.debug(f"Ensured directory exists: {directory}")
     except Exception as e:
         logger.error(f"Failed to create directory {directory}: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+# Names given to uploads persisted by the API: "<uuid4 hex>_<original name>"
+UPLOAD_NAME_RE = re.compile(r"^[0-9a-f]{32}_")
+
+def _stale_uploads(temp_dir: str, cutoff: float) -> List[str]:
+    try:
+        entries = list(os.scandir(temp_dir))
+    except FileNotFoundError:
+        return []
+    stale = []
+    for entry in entries:
+        try:
+            # Only upload temp files; anything else in the directory (e.g. tracked files) is left alone
+            if UPLOAD_NAME_RE.match(entry.name) and entry.is_file(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                stale.append(entry.path)
+        except FileNotFoundError:
+            continue
+    return stale
+
+async def sweep_stale_files(temp_dir: str, max_age: float) -> int:
+    """
+    Remove upload temp files in the temporary directory older than max_age seconds.
+    
+    Args:
+        temp_dir (str): Path to the temporary directory.
+        max_age (float): Age in seconds after which a file is considered leaked.
+    
+    Returns:
+        int: Number of files removed.
+    """
+    removed = 0
+    # The directory scan and per-entry stats are blocking; keep them off the event loop
+    stale = await asyncio.to_thread(_stale_uploads, temp_dir, time.time() - max_age)
+    for path in stale:
+        try:
+            await aiofiles.os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            # Already cleaned up by the request that created it
+            continue
+    if removed:
+        logger.info(f"Swept {removed} stale files from {temp_dir}")
+    return removed
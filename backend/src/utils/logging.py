@@ -1,7 +1,11 @@
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 logger = logging.getLogger("NotebookLM")
 logger.setLevel(logging.INFO)
+logger.propagate = False
 
 # Define the log format
 formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
@@ -9,9 +13,14 @@ formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
 # File handler for logging to app.log
 fh = logging.FileHandler("app.log")
 fh.setFormatter(formatter)
-logger.addHandler(fh)
 
 # Stream handler for logging to console
 sh = logging.StreamHandler()
 sh.setFormatter(formatter)
-logger.addHandler(sh)
\ No newline at end of file
+
+# Callers only enqueue records; a background thread does the formatting and file/console writes
+log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(log_queue))
+listener = QueueListener(log_queue, fh, sh, respect_handler_level=True)
+listener.start()
+atexit.register(listener.stop)
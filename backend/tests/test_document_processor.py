@@ -1,6 +1,6 @@
 import pytest
 import os
-from src.core.document_processor import DocumentProcessor
+from src.core.document_processor import DocumentProcessor, ProcessingResult
 from src.core.config import Config
 
 @pytest.mark.asyncio
@@ -40,4 +40,54 @@ async def test_process_document(tmp_path):
     result = await processor.process_file(str(doc_file))
     assert result.success
     assert "This is a test document" in result.content
-    assert result.metadata["type"] == "document"
\ No newline at end of file
+    assert result.metadata["type"] == "document"
+
+@pytest.mark.asyncio
+async def test_process_text():
+    processor = DocumentProcessor()
+    result = await processor.process_text("In-memory text.", {"path": "plain_text"})
+    assert result.success
+    assert result.content == "In-memory text."
+    assert result.metadata["type"] == "text"
+    assert result.metadata["path"] == "plain_text"
+
+@pytest.mark.asyncio
+async def test_result_cache_by_content(tmp_path):
+    first = tmp_path / "a.wav"
+    second = tmp_path / "b.wav"
+    first.write_bytes(b"same audio")
+    second.write_bytes(b"same audio")
+    
+    processor = DocumentProcessor()
+    key = await processor._content_key("audio", str(first))
+    assert key == await processor._content_key("audio", str(second))
+    
+    fresh = ProcessingResult(success=True, content="hello", metadata={"type": "audio", "path": str(first)})
+    processor._cache_put(key, fresh)
+    # Tagging the result returned on the miss path doesn't leak into later hits
+    fresh.metadata["original_name"] = "a.wav"
+    cached = processor._cache_get(key, str(second))
+    assert cached.content == "hello"
+    assert cached.metadata["path"] == str(second)
+    assert "original_name" not in cached.metadata
+
+@pytest.mark.asyncio
+async def test_transcribe_speech_tolerates_empty_window(monkeypatch):
+    processor = DocumentProcessor()
+    texts = {b"w1": "Hello", b"w2": "", b"w3": "world."}
+
+    async def speech_windows(file_path):
+        return list(texts)
+
+    async def request_transcription(body, headers=None):
+        return texts[body]
+
+    monkeypatch.setattr(Config, "INFERENCE_BATCHING", False)
+    monkeypatch.setattr(processor, "_speech_windows", speech_windows)
+    monkeypatch.setattr(processor, "_request_transcription", request_transcription)
+    # A window with nothing intelligible in it doesn't fail the whole file
+    assert await processor._transcribe_speech("talk.wav") == "Hello world."
+
+    texts.update({b"w1": "", b"w3": ""})
+    with pytest.raises(ValueError, match="No transcription received"):
+        await processor._transcribe_speech("talk.wav")
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from src.core.ingest_batcher import IngestBatcher
+from src.core.document_processor import ProcessingResult
+
+class FakeStore:
+    def __init__(self):
+        self.added = []
+
+    async def get(self, session_id):
+        return {"model_name": "llama-3.3-70b-versatile", "document_count": "0"}
+
+    def ingest_lock(self, session_id):
+        return asyncio.Lock()
+
+    async def add_documents(self, session_id, docs):
+        self.added.append((session_id, docs))
+        return len(self.added)
+
+class FakeRAG:
+    def __init__(self):
+        self.ingests = []
+
+    async def get(self, session_id, meta):
+        return self
+
+    async def ingest_documents(self, docs):
+        self.ingests.append(docs)
+
+def _doc(name: str) -> ProcessingResult:
+    return ProcessingResult(success=True, content=name, metadata={"path": name, "type": "text"})
+
+@pytest.mark.asyncio
+async def test_coalesces_submits_into_one_ingest():
+    store, rag = FakeStore(), FakeRAG()
+    batcher = IngestBatcher(store, rag, asyncio.Semaphore(1), max_batch=8, max_delay=0.05)
+    batcher.start()
+    for name in ("a", "b", "c"):
+        await batcher.submit("s1", [_doc(name)])
+    await asyncio.sleep(0.2)
+    assert len(rag.ingests) == 1
+    assert [d.content for d in rag.ingests[0]] == ["a", "b", "c"]
+    await batcher.stop()
+
+@pytest.mark.asyncio
+async def test_stop_flushes_in_progress_batch():
+    store, rag = FakeStore(), FakeRAG()
+    # A long window keeps the submissions in the consumer's local batch when stop() is called
+    batcher = IngestBatcher(store, rag, asyncio.Semaphore(1), max_batch=8, max_delay=10)
+    batcher.start()
+    await batcher.submit("s1", [_doc("a")])
+    await batcher.submit("s2", [_doc("b")])
+    await asyncio.sleep(0.01)
+    await batcher.submit("s1", [_doc("c")])
+    await batcher.stop()
+    ingested = sorted(d.content for docs in rag.ingests for d in docs)
+    assert ingested == ["a", "b", "c"]
+    assert sorted(session_id for session_id, _ in store.added) == ["s1", "s2"]
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from src.core.model_manager import ModelManager
 
@@ -21,4 +22,17 @@ def test_list_models():
     manager = ModelManager()
     models = manager.list_models()
     assert len(models) >= 4  # Adjust based on models defined
-    assert any(m["name"] == "llama-3.3-70b-versatile" for m in models)
\ No newline at end of file
+    assert any(m["name"] == "llama-3.3-70b-versatile" for m in models)
+
+
+def test_get_model_reuses_instance():
+    model = ModelManager().get_model("llama-3.3-70b-versatile")
+    assert ModelManager().get_model("llama-3.3-70b-versatile") is model
+    assert ModelManager().get_model("llama-3.3-70b-versatile", temperature=0.5) is not model
+
+
+def test_get_model_scoped_per_event_loop():
+    async def get():
+        return ModelManager().get_model("llama-3.3-70b-versatile")
+    # A client whose connections belong to a closed loop must not be handed to the next one
+    assert asyncio.run(get()) is not asyncio.run(get())
@@ -11,7 +11,8 @@ async def test_process_podcast():
     assert "blue" in transcript.lower()
     assert os.path.exists("transcripts")
 
-def test_generate_audio_invalid_voice():
+@pytest.mark.asyncio
+async def test_generate_audio_invalid_voice():
     processor = PodcastProcessor()
     with pytest.raises(ValueError, match="Invalid voice selection"):
-        processor.generate_audio("Host 1: Hi\nHost 2: Hello", "InvalidVoice", "Angelo")
\ No newline at end of file
+        await processor.generate_audio("Host 1: Hi\nHost 2: Hello", "InvalidVoice", "Angelo")
\ No newline at end of file
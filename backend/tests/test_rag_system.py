@@ -1,6 +1,9 @@
+import asyncio
 import pytest
+from src.core import rag_system
 from src.core.rag_system import RAGSystem
 from src.core.document_processor import ProcessingResult
+from src.core.config import Config
 
 @pytest.mark.asyncio
 async def test_ingest_documents():
@@ -18,6 +21,9 @@ async def test_query_no_documents():
     rag = RAGSystem()
     answer = await rag.query("What is this?")
     assert "No documents loaded" in answer
+    # Nothing was retrieved or generated, so neither client should have been built
+    assert "llm" not in rag.__dict__
+    assert "embeddings" not in rag.index.__dict__
 
 @pytest.mark.asyncio
 async def test_query_with_documents():
@@ -27,4 +33,108 @@ async def test_query_with_documents():
     ]
     await rag.ingest_documents(docs)
     answer = await rag.query("What color is the sky?")
-    assert "blue" in answer.lower()
\ No newline at end of file
+    assert "blue" in answer.lower()
+
+@pytest.mark.asyncio
+async def test_switch_model_reuses_index():
+    rag = RAGSystem()
+    docs = [
+        ProcessingResult(success=True, content="The sky is blue.", metadata={"path": "sky.txt", "type": "document"})
+    ]
+    await rag.ingest_documents(docs)
+    switched = RAGSystem(model_name="deepseek-r1-distill-llama-70b", index=rag.index)
+    assert switched.vector_store is rag.vector_store
+    assert "sky.txt" in switched.get_ingested_documents_info()
+
+
+@pytest.mark.asyncio
+async def test_query_stream_with_documents():
+    rag = RAGSystem()
+    docs = [
+        ProcessingResult(success=True, content="The sky is blue.", metadata={"path": "sky.txt", "type": "document"})
+    ]
+    await rag.ingest_documents(docs)
+    answer = "".join([chunk async for chunk in rag.query_stream("What color is the sky?")])
+    assert "blue" in answer.lower()
+
+@pytest.mark.asyncio
+async def test_retrieval_after_single_chunk_first_upload(monkeypatch):
+    # A session that starts with one short chunk must still retrieve what is uploaded later,
+    # including after the index is rebuilt with the quantized factory
+    monkeypatch.setattr(Config, "FAISS_TRAIN_SIZE", 8)
+    rag = RAGSystem()
+    await rag.ingest_documents([
+        ProcessingResult(success=True, content="The sky is blue.", metadata={"path": "sky.txt", "type": "document"})
+    ])
+    facts = [
+        "Paris is the capital of France.",
+        "Water boils at 100 degrees Celsius at sea level.",
+        "The mitochondria is the powerhouse of the cell.",
+        "Mount Everest is the highest mountain on Earth.",
+        "Python was created by Guido van Rossum.",
+        "The Pacific is the largest ocean.",
+        "Honey never spoils if stored properly.",
+        "Octopuses have three hearts.",
+        "The Great Wall of China is visible across northern China.",
+        "Bananas are botanically berries."
+    ]
+    await rag.ingest_documents([
+        ProcessingResult(success=True, content=fact, metadata={"path": f"fact{i}.txt", "type": "document"})
+        for i, fact in enumerate(facts)
+    ])
+    assert rag.vector_store.index.ntotal == len(facts) + 1
+    for fact in facts:
+        assert rag.vector_store.similarity_search(fact, k=1)[0].page_content == fact
+
+@pytest.mark.asyncio
+async def test_reingest_is_idempotent():
+    rag = RAGSystem()
+    docs = [
+        ProcessingResult(success=True, content="The sky is blue.", metadata={"path": "sky.txt", "type": "document"})
+    ]
+    await rag.ingest_documents(docs)
+    ntotal = rag.vector_store.index.ntotal
+    # Same source and text map to the same chunk ids, so nothing is added twice
+    await rag.ingest_documents(docs)
+    assert rag.vector_store.index.ntotal == ntotal
+
+@pytest.mark.asyncio
+async def test_query_during_ingest(monkeypatch):
+    # Searches wait for in-flight adds and the quantizer rebuild instead of reading a half-updated index
+    monkeypatch.setattr(Config, "FAISS_TRAIN_SIZE", 8)
+    rag = RAGSystem()
+    await rag.ingest_documents([
+        ProcessingResult(success=True, content="The sky is blue.", metadata={"path": "sky.txt", "type": "document"})
+    ])
+    docs = [
+        ProcessingResult(success=True, content=f"Note {i}: item {i} is filed under shelf {i % 7}.", metadata={"path": f"note{i}.txt", "type": "document"})
+        for i in range(50)
+    ]
+    answer, _ = await asyncio.gather(rag.query("What color is the sky?"), rag.ingest_documents(docs))
+    assert "blue" in answer.lower()
+    assert rag.vector_store.index.ntotal == len(docs) + 1
+
+@pytest.mark.asyncio
+async def test_failed_ingest_discards_unsaved_vectors(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_system, "EMBED_BATCH_SIZE", 1)
+    rag = RAGSystem(persist_directory=str(tmp_path))
+    await rag.ingest_documents([
+        ProcessingResult(success=True, content="The sky is blue.", metadata={"path": "sky.txt", "type": "document"})
+    ])
+    add_embeddings = rag.index._add_embeddings
+
+    def failing_add(pairs, metadatas, ids):
+        if any(meta["path"] == "bad.txt" for meta in metadatas):
+            raise RuntimeError("insert failed")
+        add_embeddings(pairs, metadatas, ids)
+
+    monkeypatch.setattr(rag.index, "_add_embeddings", failing_add)
+    docs = [
+        ProcessingResult(success=True, content=f"Document {name} has its own text.", metadata={"path": f"{name}.txt", "type": "document"})
+        for name in ("good", "bad", "other")
+    ]
+    with pytest.raises(RuntimeError):
+        await rag.ingest_documents(docs)
+    # Batches that succeeded alongside the failed one are rolled back with it
+    assert rag.vector_store.index.ntotal == 1
+    assert len(rag.document_metadata) == 1
@@ -1,7 +1,10 @@
+import io
 import pytest
+from fastapi import HTTPException, UploadFile
 from fastapi.testclient import TestClient
 from src.main import app  # Assuming main.py is in the root
 from src.core.document_processor import ProcessingResult
+from src.core.config import Config
 
 # Create a test client
 client = TestClient(app)
@@ -41,4 +44,19 @@ async def test_list_models():
     assert response.status_code == 200
     models = response.json()["models"]
     assert len(models) > 0
-    assert any(m["name"] == "llama-3.3-70b-versatile" for m in models)
\ No newline at end of file
+    assert any(m["name"] == "llama-3.3-70b-versatile" for m in models)
+
+@pytest.mark.asyncio
+async def test_oversized_upload_removes_saved_siblings(tmp_path, monkeypatch):
+    from src.api.routes import _persist_uploads
+    monkeypatch.setattr(Config, "TMP_DIR", str(tmp_path))
+    monkeypatch.setattr(Config, "MAX_FILE_SIZE", 16)
+    files = [
+        UploadFile(io.BytesIO(b"small file"), filename="small.txt"),
+        UploadFile(io.BytesIO(b"A" * 17), filename="large.txt")
+    ]
+    with pytest.raises(HTTPException) as exc:
+        await _persist_uploads(files)
+    assert exc.value.status_code == 413
+    # The file that saved fine is not left behind in the temp dir
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,59 @@
+import pytest
+import time
+import uuid
+from src.core.session_store import SessionStore
+from src.core.document_processor import ProcessingResult
+
+@pytest.mark.asyncio
+async def test_create_and_get_session():
+    store = SessionStore()
+    session_id = str(uuid.uuid4())
+    docs = [ProcessingResult(success=True, content="Test content", metadata={"path": "test.txt", "type": "text"})]
+    await store.create(session_id, {"title": "Test", "created_at": time.time(), "model_name": "llama-3.3-70b-versatile", "chunk_size": 1000, "chunk_overlap": 200, "index_path": "vector_store/x"}, docs)
+
+    meta = await store.get(session_id)
+    assert meta["model_name"] == "llama-3.3-70b-versatile"
+    assert int(meta["document_count"]) == 1
+    assert (await store.get_documents(session_id))[0].content == "Test content"
+    assert any(s["id"] == session_id for s in await store.list())
+
+    await store.delete(session_id)
+    assert await store.get(session_id) is None
+    await store.close()
+
+@pytest.mark.asyncio
+async def test_add_documents_updates_count():
+    store = SessionStore()
+    session_id = str(uuid.uuid4())
+    await store.create(session_id, {"title": "Test", "created_at": time.time(), "model_name": "gpt-4o", "chunk_size": 1000, "chunk_overlap": 200, "index_path": "vector_store/y"}, [])
+    await store.add_documents(session_id, [ProcessingResult(success=True, content="More", metadata={"path": "more.txt"})])
+    meta = await store.get(session_id)
+    assert int(meta["document_count"]) == 1
+    summary = next(s for s in await store.list() if s["id"] == session_id)
+    assert summary["document_count"] == 1
+    await store.delete(session_id)
+    await store.close()
+
+@pytest.mark.asyncio
+async def test_add_documents_to_deleted_session():
+    store = SessionStore()
+    session_id = str(uuid.uuid4())
+    await store.create(session_id, {"title": "Test", "created_at": time.time(), "model_name": "gpt-4o", "chunk_size": 1000, "chunk_overlap": 200, "index_path": "vector_store/z"}, [])
+    await store.delete(session_id)
+    # A batched ingest finishing after the delete must not resurrect a partial session
+    assert await store.add_documents(session_id, [ProcessingResult(success=True, content="Late", metadata={"path": "late.txt"})]) is None
+    assert await store.get(session_id) is None
+    assert await store.get_documents(session_id) == []
+    await store.close()
+
+@pytest.mark.asyncio
+async def test_list_in_creation_order():
+    store = SessionStore()
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    for i, session_id in enumerate(ids):
+        await store.create(session_id, {"title": "Test", "created_at": time.time() + i, "model_name": "gpt-4o", "chunk_size": 1000, "chunk_overlap": 200, "index_path": f"vector_store/{session_id}"}, [])
+    listed = [s["id"] for s in await store.list() if s["id"] in ids]
+    assert listed == ids
+    for session_id in ids:
+        await store.delete(session_id)
+    await store.close()
@@ -0,0 +1,19 @@
+import random
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from src.core.text_splitter import LengthCachingTextSplitter
+
+WORDS = ["a", "sky", "blue", "document", "retrieval", "x" * 40, "end."]
+GAPS = [" ", " ", " ", "\n", "\n\n", ""]
+
+def _random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(WORDS) + rng.choice(GAPS) for _ in range(rng.randint(0, 300)))
+
+def test_matches_recursive_character_splitter():
+    # The override replaces a private LangChain method, so pin it to the upstream output
+    rng = random.Random(0)
+    for _ in range(300):
+        chunk_size = rng.randint(5, 300)
+        chunk_overlap = rng.randint(0, chunk_size - 1)
+        text = _random_text(rng)
+        expected = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap).split_text(text)
+        assert LengthCachingTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap).split_text(text) == expected
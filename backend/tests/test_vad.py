@@ -0,0 +1,29 @@
+import numpy as np
+from src.core import vad
+
+def test_model_load_failure_disables_vad(monkeypatch):
+    def broken_load(onnx=True):
+        raise RuntimeError("onnxruntime not installed")
+    monkeypatch.setattr(vad, "load_silero_vad", broken_load)
+    monkeypatch.setattr(vad, "_MODEL", None)
+    monkeypatch.setattr(vad, "_LOAD_FAILED", False)
+    # Callers fall back to whole-file transcription instead of failing the upload
+    assert vad.speech_windows(np.zeros(vad.SAMPLE_RATE, dtype=np.float32)) is None
+    assert not vad.is_available()
+
+def test_windows_hold_only_speech(monkeypatch):
+    rate = vad.SAMPLE_RATE
+    audio = np.arange(80 * rate, dtype=np.float32)
+    # 10 s and 15 s of speech separated by silence, then a single 35 s segment
+    timestamps = [
+        {"start": 0, "end": 10 * rate},
+        {"start": 20 * rate, "end": 35 * rate},
+        {"start": 40 * rate, "end": 75 * rate}
+    ]
+    monkeypatch.setattr(vad, "_get_model", lambda: object())
+    monkeypatch.setattr(vad, "get_speech_timestamps", lambda audio, model, sampling_rate: timestamps, raising=False)
+    windows = vad.speech_windows(audio, max_seconds=30)
+    assert [len(w) // rate for w in windows] == [25, 30, 5]
+    # The silence between the first two segments is dropped, not carried into the window
+    assert np.array_equal(windows[0], np.concatenate([audio[:10 * rate], audio[20 * rate:35 * rate]]))
+    assert np.array_equal(np.concatenate(windows[1:]), audio[40 * rate:75 * rate])